@@ -1,33 +1,39 @@
 """
 Health-check, status & observability endpoints.
 
-GET /health     — quick liveness probe used by the Tauri frontend boot sequence.
+GET /health     — quick liveness probe used by the Tauri frontend boot sequence
+                  (model checks cached for a few seconds; ?deep=1 re-checks).
 GET /llm/status — LLM inference queue status (concurrency, running, waiting).
 GET /metrics    — operational metrics: request counts, latency percentiles, recent errors.
 GET /workers/status — worker pool status: concurrency, running, queued per pool.
 """
 
 import logging
+import os
+import stat
+import time
 from pathlib import Path
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
-from app.config import (
-    MODEL_CONFIGS,
-    WHISPER_MODEL_PATH,
-    analyze_hardware,
-    get_llm_model_path,
-)
+from app.config import WHISPER_MODEL_PATH
 
 router = APIRouter()
 logger = logging.getLogger("dental_assistant.health")
 
+# Probes may hit /health every second; the disk checks behind models_ready /
+# whisper_ready are reused for a short while (cleared after a download).
+_health_cache: dict = {"result": None, "ts": 0.0}
+_HEALTH_TTL = 5.0  # seconds
+
 
 def _is_model_valid(model_path: Path, expected_size_gb: float) -> bool:
     """Check if the model file exists and has a reasonable size."""
-    if not model_path.exists():
+    try:
+        st = os.stat(model_path)
+    except OSError:
         return False
-    file_size_gb = model_path.stat().st_size / (1024 ** 3)
+    file_size_gb = st.st_size / (1024 ** 3)
     min_expected = expected_size_gb * 0.8
     if file_size_gb < min_expected:
         logger.warning(
@@ -41,29 +47,36 @@ def _is_model_valid(model_path: Path, expected_size_gb: float) -> bool:
 
 def _is_whisper_valid() -> bool:
     """Check if the Whisper model directory exists and contains the required files."""
+    # Two stats on the files that matter, instead of listing the directory
     model_dir = Path(WHISPER_MODEL_PATH)
-    if not model_dir.exists():
+    try:
+        bin_st = os.stat(model_dir / "model.bin")
+        cfg_st = os.stat(model_dir / "config.json")
+    except OSError:
         return False
-    required = {"model.bin", "config.json"}
-    existing = {f.name for f in model_dir.iterdir()}
-    if not required.issubset(existing):
+    if not (stat.S_ISREG(bin_st.st_mode) and stat.S_ISREG(cfg_st.st_mode)):
         return False
-    model_bin = model_dir / "model.bin"
-    if model_bin.stat().st_size < 350 * 1024 * 1024:
-        logger.warning("Whisper model.bin appears incomplete: %d bytes", model_bin.stat().st_size)
+    if bin_st.st_size < 350 * 1024 * 1024:
+        logger.warning("Whisper model.bin appears incomplete: %d bytes", bin_st.st_size)
         return False
     return True
 
 
 @router.get("/health")
-async def health():
-    profile = analyze_hardware()
-    cfg = MODEL_CONFIGS[profile]
-    model_path = get_llm_model_path(profile)
-    expected_size = cfg.get("size_gb", 0)
-    models_ready = _is_model_valid(model_path, expected_size)
-    whisper_ready = _is_whisper_valid()
-    return {"status": "ok", "models_ready": models_ready, "whisper_ready": whisper_ready}
+async def health(request: Request, deep: bool = False):
+    now = time.monotonic()
+    result = _health_cache["result"]
+    if deep or result is None or now - _health_cache["ts"] >= _HEALTH_TTL:
+        # Model path and expected size are resolved once in the lifespan
+        state = request.app.state
+        result = {
+            "status": "ok",
+            "models_ready": _is_model_valid(state.llm_model_path, state.llm_expected_size_gb),
+            "whisper_ready": _is_whisper_valid(),
+        }
+        _health_cache["result"] = result
+        _health_cache["ts"] = now
+    return result
 
 
 @router.get("/llm/status")
@@ -102,9 +115,11 @@ async def workers_status():
     """
     Combined worker pool status across all heavy-task pools.
 
-    Shows per-pool: concurrency limit, running tasks, queued tasks,
-    total processed, total errors, and whether the pool is saturated.
-    Pools: llm, whisper, rag.
+    Shows per-pool: concurrency limit, running tasks, queued tasks (and the
+    queue limit), queue-wait percentiles, total processed, total errors, and
+    whether the pool is saturated.  Pools: llm, whisper, rag; plus
+    "executor" with the shared thread executor's max/alive threads and
+    work-queue depth.
     """
     from app.worker import WorkerPool
 
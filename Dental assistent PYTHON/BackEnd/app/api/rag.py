@@ -9,18 +9,19 @@ POST /summarize-rag           — RAG-enhanced SmartNote (blocking)
 POST /summarize-stream-rag    — RAG-enhanced SmartNote (SSE streaming)
 """
 
-import json
 import logging
 import threading
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse, StreamingResponse
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
-from app.config import RAG_DATA_DIR, get_llm_model_path
+from app.config import RAG_DATA_DIR, is_llm_model_ready
 from app.llm_config import build_rag_smartnote_prompt
-from app.sanitize import sanitize_input
+from app.responses import FastJSONResponse
+from app.sanitize import MAX_TEXT_CHARS, sanitize_input
 from app.security import verify_api_key
+from app.sse import SSE_DONE, SSE_HEADERS, coalesce_tokens, sse_chunk, sse_event
 
 router = APIRouter(tags=["rag"])
 logger = logging.getLogger("dental_assistant.rag")
@@ -44,14 +45,14 @@ def initialize_rag() -> None:
     """
     global _rag_available
     try:
-        from app.rag.store import DentalDocumentStore
-        from app.rag.pipelines import DentalRAGPipeline
+        from app.rag.store import get_document_store
+        from app.rag.pipelines import get_rag_pipeline
         from app.rag.dental_knowledge import get_seed_knowledge
 
-        store = DentalDocumentStore()
+        store = get_document_store()
         store.initialize(RAG_DATA_DIR)
 
-        pipeline = DentalRAGPipeline()
+        pipeline = get_rag_pipeline()
         pipeline.initialize(store)
 
         # Seed knowledge base on first run
@@ -92,12 +93,22 @@ def initialize_rag() -> None:
         logger.exception("Failed to initialize RAG system. RAG features disabled.")
 
 
+def shutdown_rag(timeout: float = 30.0) -> None:
+    """Wait for queued consultations to reach ChromaDB before the process exits."""
+    if not _rag_available:
+        return
+    from app.rag.pipelines import get_rag_pipeline
+
+    if not get_rag_pipeline().flush(timeout):
+        logger.warning("RAG indexer still busy after %.0fs; the journal has the records", timeout)
+
+
 # ---------------------------------------------------------------------------
 # Request / response models
 # ---------------------------------------------------------------------------
 
 class SummaryRequest(BaseModel):
-    text: str
+    text: str = Field(max_length=MAX_TEXT_CHARS)
 
 
 class SaveConsultationRequest(BaseModel):
@@ -128,9 +139,9 @@ async def rag_status():
             "knowledge_count": 0,
         }
     try:
-        from app.rag.store import DentalDocumentStore
+        from app.rag.store import get_document_store
 
-        store = DentalDocumentStore()
+        store = get_document_store()
         stats = store.get_stats()
         return {"available": True, **stats}
     except Exception as e:
@@ -143,10 +154,10 @@ async def save_consultation(req: SaveConsultationRequest):
     if not _rag_available:
         return {"status": "rag_unavailable", "detail": "RAG system not available"}
 
-    from app.rag.pipelines import DentalRAGPipeline
+    from app.rag.pipelines import get_rag_pipeline
     from app.worker import WorkerPool
 
-    pipeline = DentalRAGPipeline()
+    pipeline = get_rag_pipeline()
     return await WorkerPool().run(
         "rag",
         lambda: pipeline.save_consultation(
@@ -165,14 +176,14 @@ async def search_consultations(req: SearchRequest):
     if not _rag_available:
         return {"results": [], "detail": "RAG system not available"}
 
-    from app.rag.pipelines import DentalRAGPipeline
+    from app.rag.pipelines import get_rag_pipeline
     from app.worker import WorkerPool
 
     sanitized_query = sanitize_input(req.query, max_length=500)
     if not sanitized_query:
         raise HTTPException(status_code=400, detail="Search query is empty or invalid.")
 
-    pipeline = DentalRAGPipeline()
+    pipeline = get_rag_pipeline()
     results = await WorkerPool().run(
         "rag",
         pipeline.search_consultations,
@@ -193,7 +204,7 @@ async def export_consultations():
     from app.rag.journal import read_all as journal_read_all
 
     records = journal_read_all()
-    return JSONResponse(
+    return FastJSONResponse(
         content={"consultations": records, "count": len(records)},
         headers={
             "Content-Disposition": 'attachment; filename="consultations-export.json"',
@@ -209,10 +220,10 @@ async def _get_rag_context(text: str) -> str:
     """Retrieve relevant dental knowledge for the given text. Returns '' if unavailable."""
     if not _rag_available:
         return ""
-    from app.rag.pipelines import DentalRAGPipeline
+    from app.rag.pipelines import get_rag_pipeline
     from app.worker import WorkerPool
 
-    pipeline = DentalRAGPipeline()
+    pipeline = get_rag_pipeline()
     return await WorkerPool().run("rag", pipeline.get_rag_context, text)
 
 
@@ -225,7 +236,7 @@ async def summarize_with_rag(req: SummaryRequest):
     the SmartNote in verified medical references and protocols.
     Falls back to standard summarization if RAG is unavailable.
     """
-    if not get_llm_model_path().exists():
+    if not is_llm_model_ready():
         raise HTTPException(status_code=503, detail="Model not downloaded. Please run setup.")
 
     sanitized_text = sanitize_input(req.text)
@@ -255,7 +266,7 @@ async def summarize_stream_with_rag(req: SummaryRequest, request: Request):
     for higher quality, reference-grounded SmartNotes.
     Automatically stops generation when the client disconnects.
     """
-    if not get_llm_model_path().exists():
+    if not is_llm_model_ready():
         raise HTTPException(status_code=503, detail="Model not downloaded. Please run setup.")
 
     sanitized_text = sanitize_input(req.text)
@@ -273,23 +284,19 @@ async def summarize_stream_with_rag(req: SummaryRequest, request: Request):
 
     async def event_generator():
         try:
-            yield f"data: {json.dumps({'rag_enhanced': rag_enhanced})}\n\n"
-            async for chunk in llm.generate_stream(prompt, cancel_event=cancel):
+            yield sse_event({"rag_enhanced": rag_enhanced})
+            async for chunk in coalesce_tokens(llm.generate_stream(prompt, cancel_event=cancel)):
                 if await request.is_disconnected():
                     cancel.set()
                     break
-                yield f"data: {json.dumps({'chunk': chunk})}\n\n"
-            yield "data: [DONE]\n\n"
+                yield sse_chunk(chunk)
+            yield SSE_DONE
         except Exception as e:
             logger.exception("RAG streaming error")
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            yield sse_event({"error": str(e)})
 
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+        headers=SSE_HEADERS,
     )
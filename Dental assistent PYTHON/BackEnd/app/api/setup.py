@@ -4,34 +4,41 @@ Model setup & download endpoints.
 GET  /setup/check-models            — hardware profile + model status
 POST /setup/download-model          — start LLM model download
 GET  /setup/download-progress       — SSE for LLM download progress
+POST /setup/reload-model            — swap the downloaded LLM into memory
 POST /setup/download-whisper        — start Whisper model download
 GET  /setup/whisper-download-progress — SSE for Whisper download progress
 """
 
 import asyncio
+import functools
 import hashlib
-import json
 import logging
 import os
+import stat
 import threading
 import time
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import Callable
 
-import requests
+import httpx
 from fastapi import APIRouter, BackgroundTasks, Depends
 from fastapi.responses import StreamingResponse
 
+from app.api.health import _health_cache
 from app.config import (
     ALTERNATIVE_MODELS,
     MODEL_CONFIGS,
     WHISPER_EXPECTED_SIZE_MB,
     WHISPER_MODEL_FILES,
     WHISPER_MODEL_PATH,
+    _model_ready_cache,
     analyze_hardware,
     get_hardware_info,
     get_llm_model_path,
 )
 from app.security import verify_api_key
+from app.sse import sse_event
 
 router = APIRouter(prefix="/setup", tags=["setup"])
 logger = logging.getLogger("dental_assistant.setup")
@@ -40,41 +47,64 @@ logger = logging.getLogger("dental_assistant.setup")
 # Thread-safe download progress tracker
 # ---------------------------------------------------------------------------
 
+# SSE clients are woken when progress moves by this many percentage points,
+# and re-sent the current state at least this often otherwise.
+_PUSH_STEP_PCT = 0.5
+_PUSH_MAX_INTERVAL_S = 2.0
+
+
+@dataclass(frozen=True, slots=True)
+class DownloadSnapshot:
+    """Immutable point-in-time download state (hashable, so SSE lines can be cached)."""
+
+    active: bool = False
+    progress: float = 0.0
+    downloaded_bytes: int = 0
+    total_bytes: int = 0
+    current_file: str = ""
+    error: str | None = None
+    done: bool = False
+
 
 class DownloadTracker:
     """
-    Encapsulates download state behind a lock so that background-thread
-    writers and async SSE readers never see torn state.
+    Publishes download state as immutable DownloadSnapshot objects.
+
+    Writers build a new snapshot under a lock and swap it in with a single
+    attribute assignment, so readers (the SSE handlers) just read
+    ``snapshot()`` — no lock, no copy, never torn.
 
     ``try_start()`` is an atomic check-and-set that prevents two
     concurrent POST requests from both launching a download.
+
+    SSE handlers wait on ``changed()`` instead of polling: it is set when
+    progress advances by _PUSH_STEP_PCT or the download starts/ends.  Each
+    event is one-shot (replaced when set), so no client can clear it under
+    another.  Mutations must happen on the event loop (the downloads are
+    coroutines).
     """
 
     def __init__(self) -> None:
         self._lock = threading.Lock()
-        self._active = False
-        self._progress = 0.0
-        self._downloaded_bytes = 0
-        self._total_bytes = 0
-        self._current_file = ""
-        self._error: str | None = None
-        self._done = False
+        self._state = DownloadSnapshot()
+        self._changed = asyncio.Event()
+        self._pushed_progress = 0.0
 
-    # -- mutations (called from the download thread) ----------------------
+    def _notify(self) -> None:
+        event, self._changed = self._changed, asyncio.Event()
+        self._pushed_progress = self._state.progress
+        event.set()
+
+    # -- mutations (called from the download task) ------------------------
 
     def try_start(self) -> bool:
         """Atomically set active if not already. Returns True on success."""
         with self._lock:
-            if self._active:
+            if self._state.active:
                 return False
-            self._active = True
-            self._progress = 0.0
-            self._downloaded_bytes = 0
-            self._total_bytes = 0
-            self._current_file = ""
-            self._error = None
-            self._done = False
-            return True
+            self._state = DownloadSnapshot(active=True)
+        self._notify()
+        return True
 
     def update(
         self,
@@ -83,43 +113,75 @@ class DownloadTracker:
         current_file: str = "",
     ) -> None:
         with self._lock:
-            self._downloaded_bytes = downloaded_bytes
-            self._total_bytes = total_bytes
-            if total_bytes > 0:
-                self._progress = round((downloaded_bytes / total_bytes) * 100, 1)
-            if current_file:
-                self._current_file = current_file
+            state = self._state
+            self._state = replace(
+                state,
+                downloaded_bytes=downloaded_bytes,
+                total_bytes=total_bytes,
+                progress=(
+                    round((downloaded_bytes / total_bytes) * 100, 1)
+                    if total_bytes > 0 else state.progress
+                ),
+                current_file=current_file or state.current_file,
+            )
+            advanced = self._state.progress - self._pushed_progress >= _PUSH_STEP_PCT
+        if advanced or self._state.current_file != state.current_file:
+            self._notify()
 
     def finish(self) -> None:
         with self._lock:
-            self._progress = 100.0
-            self._done = True
-            self._active = False
+            self._state = replace(self._state, progress=100.0, done=True, active=False)
+        self._notify()
 
     def fail(self, error: str) -> None:
         with self._lock:
-            self._error = error
-            self._active = False
+            self._state = replace(self._state, error=error, active=False)
+        self._notify()
 
     # -- reads (called from async SSE handlers) ---------------------------
 
-    def snapshot(self) -> dict:
-        """Return a consistent, point-in-time copy of the state."""
-        with self._lock:
-            return {
-                "active": self._active,
-                "progress": self._progress,
-                "downloaded_bytes": self._downloaded_bytes,
-                "total_bytes": self._total_bytes,
-                "current_file": self._current_file,
-                "error": self._error,
-                "done": self._done,
-            }
+    def snapshot(self) -> DownloadSnapshot:
+        """Return the current state (immutable, safe to hold on to)."""
+        return self._state
+
+    def changed(self) -> asyncio.Event:
+        """Event set at the next notable change after this call."""
+        return self._changed
 
     @property
     def is_active(self) -> bool:
-        with self._lock:
-            return self._active
+        return self._state.active
+
+
+async def _progress_stream(tracker: DownloadTracker, with_file: bool):
+    """SSE generator: push on progress, at least every _PUSH_MAX_INTERVAL_S."""
+    while True:
+        changed = tracker.changed()
+        snap = tracker.snapshot()
+        yield _progress_event(snap, with_file)
+        if snap.error or snap.done:
+            return
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=_PUSH_MAX_INTERVAL_S)
+        except asyncio.TimeoutError:
+            pass  # nothing new: re-send the current state as a keep-alive
+
+
+@functools.lru_cache(maxsize=8)
+def _progress_event(snap: DownloadSnapshot, with_file: bool) -> bytes:
+    """SSE line for *snap*, built once per state change and shared by every client."""
+    if snap.error:
+        return sse_event({"error": snap.error})
+    payload = {
+        "progress": snap.progress,
+        "downloaded_bytes": snap.downloaded_bytes,
+        "total_bytes": snap.total_bytes,
+    }
+    if with_file:
+        payload["current_file"] = snap.current_file
+    if snap.done:
+        payload["done"] = True
+    return sse_event(payload)
 
 
 _llm_tracker = DownloadTracker()
@@ -130,6 +192,18 @@ _whisper_tracker = DownloadTracker()
 # ---------------------------------------------------------------------------
 _check_models_cache: dict = {"result": None, "ts": 0.0}
 _CHECK_MODELS_TTL = 5.0  # seconds
+# Single-flight: when the cache expires, one request rebuilds it and any
+# concurrent ones wait for that result instead of re-validating in parallel.
+_check_models_lock = asyncio.Lock()
+
+
+def _cached_check_models() -> dict | None:
+    if (
+        _check_models_cache["result"] is not None
+        and (time.monotonic() - _check_models_cache["ts"]) < _CHECK_MODELS_TTL
+    ):
+        return _check_models_cache["result"]
+    return None
 
 
 # ---------------------------------------------------------------------------
@@ -140,13 +214,38 @@ def _ensure_parent_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
+# Digests of files already hashed, keyed by (path, size, mtime_ns): model
+# files are GBs and check-models / download-* would otherwise re-hash them
+# on every call.  Any rewrite of the file changes the key.
+_HASH_BLOCK = 4 * 1024 * 1024
+_file_hashes: dict[tuple[str, int, int], str] = {}
+
+
+def _hash_key(path: Path) -> tuple[str, int, int]:
+    st = path.stat()
+    return (str(path), st.st_size, st.st_mtime_ns)
+
+
+def _remember_sha256(path: Path, digest: str) -> None:
+    """Record the digest computed while downloading *path*."""
+    _file_hashes[_hash_key(path)] = digest
+
+
 def _sha256_file(path: Path) -> str:
     """Compute the SHA-256 hex digest of *path* using a streaming read."""
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(256 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    key = _hash_key(path)
+    digest = _file_hashes.get(key)
+    if digest is None:
+        # hashlib runs on the CPU's SHA extensions and releases the GIL; one
+        # reused 4 MiB buffer keeps the loop free of per-block allocations.
+        h = hashlib.sha256()
+        buf = bytearray(_HASH_BLOCK)
+        view = memoryview(buf)
+        with open(path, "rb", buffering=0) as f:
+            while n := f.readinto(buf):
+                h.update(view[:n])
+        digest = _file_hashes[key] = h.hexdigest()
+    return digest
 
 
 def _verify_sha256(path: Path, expected: str | None) -> bool:
@@ -173,9 +272,11 @@ def _is_model_valid(
     expected_sha256: str | None = None,
 ) -> bool:
     """Check if the model file exists, has a reasonable size, and matches its checksum."""
-    if not model_path.exists():
+    try:
+        st = os.stat(model_path)
+    except OSError:
         return False
-    file_size_gb = model_path.stat().st_size / (1024 ** 3)
+    file_size_gb = st.st_size / (1024 ** 3)
     min_expected = expected_size_gb * 0.8
     if file_size_gb < min_expected:
         logger.warning(
@@ -191,16 +292,17 @@ def _is_model_valid(
 
 def _is_whisper_valid() -> bool:
     """Check if the Whisper model directory exists and contains required files."""
+    # Two stats on the required files, instead of listing the directory
     model_dir = Path(WHISPER_MODEL_PATH)
-    if not model_dir.exists():
+    try:
+        bin_st = os.stat(model_dir / "model.bin")
+        cfg_st = os.stat(model_dir / "config.json")
+    except OSError:
         return False
-    required = {"model.bin", "config.json"}
-    existing = {f.name for f in model_dir.iterdir()}
-    if not required.issubset(existing):
+    if not (stat.S_ISREG(bin_st.st_mode) and stat.S_ISREG(cfg_st.st_mode)):
         return False
-    model_bin = model_dir / "model.bin"
-    if model_bin.stat().st_size < 350 * 1024 * 1024:
-        logger.warning("Whisper model.bin appears incomplete: %d bytes", model_bin.stat().st_size)
+    if bin_st.st_size < 350 * 1024 * 1024:
+        logger.warning("Whisper model.bin appears incomplete: %d bytes", bin_st.st_size)
         return False
     # Verify per-file checksums when configured
     for file_info in WHISPER_MODEL_FILES:
@@ -210,11 +312,83 @@ def _is_whisper_valid() -> bool:
     return True
 
 
+# ---------------------------------------------------------------------------
+# Streaming download (shared by the LLM and Whisper downloads)
+# ---------------------------------------------------------------------------
+
+# Large reads keep the per-chunk Python work (thread hop, tracker update)
+# negligible next to the bytes moved; progress is published every
+# _PROGRESS_STEP bytes, which is still several updates a second.
+_DOWNLOAD_CHUNK = 4 * 1024 * 1024
+_PROGRESS_STEP = 8 * 1024 * 1024
+
+
+# Sent with every download request; the token is read once at import
+_HF_HEADERS = {"User-Agent": "dental-assistant-backend/1.0"}
+if _hf_token := os.getenv("HUGGINGFACE_HUB_TOKEN"):
+    _HF_HEADERS["Authorization"] = f"Bearer {_hf_token}"
+
+
+def _write_chunk(f, file_hash, chunk: bytes) -> None:
+    f.write(chunk)
+    file_hash.update(chunk)
+
+
+def _sync_file(f) -> None:
+    # On disk before the rename makes it visible, and no dirty pages left for
+    # the model load (which mmaps the file) to wait on behind writeback
+    f.flush()
+    os.fsync(f.fileno())
+
+
+async def _stream_download(
+    client: httpx.AsyncClient,
+    url: str,
+    tmp_path: Path,
+    on_progress: Callable[[int, int], None],
+) -> tuple[str, int]:
+    """
+    Stream *url* into *tmp_path* and return ``(sha256_hex, bytes_written)``.
+
+    The socket is read on the event loop; file writes and hashing (both of
+    which release the GIL on large buffers) go to a worker thread so the
+    loop keeps serving the SSE progress streams.  ``on_progress`` gets
+    ``(bytes_so_far, content_length)`` every _PROGRESS_STEP bytes and at the
+    end — content_length is 0 if unknown.
+    """
+    file_hash = hashlib.sha256()
+    written = 0
+    reported = 0
+    async with client.stream("GET", url) as r:
+        r.raise_for_status()
+        total = int(r.headers.get("Content-Length", 0))
+        on_progress(0, total)
+        with open(tmp_path, "wb") as f:
+            async for chunk in r.aiter_bytes(chunk_size=_DOWNLOAD_CHUNK):
+                await asyncio.to_thread(_write_chunk, f, file_hash, chunk)
+                written += len(chunk)
+                if written - reported >= _PROGRESS_STEP:
+                    on_progress(written, total)
+                    reported = written
+            await asyncio.to_thread(_sync_file, f)
+        on_progress(written, total)
+    return file_hash.hexdigest(), written
+
+
+def _download_client(read_timeout: float) -> httpx.AsyncClient:
+    # Hugging Face serves files through a redirect to its CDN
+    return httpx.AsyncClient(
+        headers=_HF_HEADERS,
+        timeout=httpx.Timeout(read_timeout, connect=10),
+        follow_redirects=True,
+    )
+
+
 # ---------------------------------------------------------------------------
 # LLM download internals
 # ---------------------------------------------------------------------------
 
-def _atomic_download(
+async def _atomic_download(
     url: str,
     dest_path: Path,
     expected_sha256: str | None = None,
@@ -224,35 +398,15 @@ def _atomic_download(
     Writes to .part file then renames atomically.
     Progress is published via ``_llm_tracker`` for the SSE endpoint.
     """
+    tmp_path = dest_path.with_suffix(dest_path.suffix + ".part")
     try:
         _ensure_parent_dir(dest_path)
-        tmp_path = dest_path.with_suffix(dest_path.suffix + ".part")
 
         logger.info("Downloading model: %s -> %s", url, dest_path)
 
-        headers = {}
-        hf_token = os.getenv("HUGGINGFACE_HUB_TOKEN")
-        if hf_token:
-            headers["Authorization"] = f"Bearer {hf_token}"
-
-        sha256_hash = hashlib.sha256()
-
-        with requests.get(url, headers=headers, stream=True, timeout=(10, 180)) as r:
-            r.raise_for_status()
-            total = int(r.headers.get("Content-Length", 0))
-            downloaded = 0
-            chunk_size = 256 * 1024
-
-            with open(tmp_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        sha256_hash.update(chunk)
-                        downloaded += len(chunk)
-                        _llm_tracker.update(downloaded, total)
-                f.flush()
-
-        actual_hash = sha256_hash.hexdigest()
+        async with _download_client(180) as client:
+            actual_hash, _ = await _stream_download(client, url, tmp_path, _llm_tracker.update)
+
         logger.info("Model SHA-256: %s", actual_hash)
 
         if expected_sha256 and actual_hash != expected_sha256.lower():
@@ -265,15 +419,17 @@ def _atomic_download(
             raise ValueError(msg)
 
         tmp_path.replace(dest_path)
+        _remember_sha256(dest_path, actual_hash)
         _llm_tracker.finish()
         _check_models_cache["ts"] = 0.0
+        _model_ready_cache["ts"] = 0.0
+        _health_cache["ts"] = 0.0
         logger.info("Model download complete: %s", dest_path)
 
     except Exception as exc:
         logger.exception("Model download failed")
         _llm_tracker.fail(str(exc))
         try:
-            tmp_path = dest_path.with_suffix(dest_path.suffix + ".part")
             if tmp_path.exists():
                 tmp_path.unlink()
         except Exception:
@@ -285,76 +441,87 @@ def _atomic_download(
 # Whisper download internals
 # ---------------------------------------------------------------------------
 
-def _download_whisper_files() -> None:
+# Whisper files fetched at once: overlaps each file's TLS setup and
+# time-to-first-byte instead of paying them back to back.
+_WHISPER_PARALLEL_FILES = 4
+
+
+async def _download_whisper_file(
+    client: httpx.AsyncClient,
+    file_info: dict,
+    dest_dir: Path,
+    on_progress: Callable[[int, int], None],
+) -> None:
+    """Download, verify and atomically install one Whisper model file."""
+    fname = file_info["name"]
+    expected_sha = file_info.get("sha256")
+    dest_file = dest_dir / fname
+    tmp_file = dest_file.with_suffix(dest_file.suffix + ".part")
+
+    logger.info("Downloading Whisper file: %s", fname)
+    try:
+        actual_hash, _ = await _stream_download(client, file_info["url"], tmp_file, on_progress)
+        logger.info("Whisper %s SHA-256: %s", fname, actual_hash)
+
+        if expected_sha and actual_hash != expected_sha.lower():
+            raise ValueError(
+                f"SHA-256 mismatch for {fname}: "
+                f"expected {expected_sha}, got {actual_hash}"
+            )
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+    tmp_file.replace(dest_file)
+    _remember_sha256(dest_file, actual_hash)
+    logger.info("Whisper file complete: %s", fname)
+
+
+async def _download_whisper_files() -> None:
     """
     Download all Whisper model files into the whisper-small directory.
-    Tracks cumulative progress across all files via ``_whisper_tracker``.
+    Files are fetched in parallel (up to _WHISPER_PARALLEL_FILES at once);
+    cumulative progress across all of them goes to ``_whisper_tracker``.
     Each file is SHA-256-verified when a known hash is configured.
     """
     try:
-        total_expected = int(
-            sum(f["size_mb"] for f in WHISPER_MODEL_FILES) * 1024 * 1024
-        )
-
         dest_dir = Path(WHISPER_MODEL_PATH)
         dest_dir.mkdir(parents=True, exist_ok=True)
 
-        headers = {}
-        hf_token = os.getenv("HUGGINGFACE_HUB_TOKEN")
-        if hf_token:
-            headers["Authorization"] = f"Bearer {hf_token}"
+        # Per-file bytes done and sizes: configured estimates, replaced by
+        # each file's Content-Length as soon as its headers arrive.  Only
+        # touched from the event loop, so no lock is needed.
+        done = [0] * len(WHISPER_MODEL_FILES)
+        sizes = [int(f["size_mb"] * 1024 * 1024) for f in WHISPER_MODEL_FILES]
 
-        cumulative = 0
-        remaining_estimate = total_expected
-
-        for file_info in WHISPER_MODEL_FILES:
-            fname = file_info["name"]
-            url = file_info["url"]
-            expected_sha = file_info.get("sha256")
-            dest_file = dest_dir / fname
-            tmp_file = dest_file.with_suffix(dest_file.suffix + ".part")
-            file_estimate = int(file_info["size_mb"] * 1024 * 1024)
-
-            logger.info("Downloading Whisper file: %s", fname)
-            file_hash = hashlib.sha256()
-
-            with requests.get(url, headers=headers, stream=True, timeout=(10, 300)) as r:
-                r.raise_for_status()
-                file_total = int(r.headers.get("Content-Length", 0))
+        def progress_for(i: int, fname: str) -> Callable[[int, int], None]:
+            def on_progress(file_done: int, file_total: int) -> None:
+                done[i] = file_done
                 if file_total:
-                    remaining_estimate -= file_estimate
-                    adjusted_total = cumulative + file_total + remaining_estimate
-                else:
-                    remaining_estimate -= file_estimate
-                    adjusted_total = total_expected
-
-                chunk_size = 256 * 1024
-                with open(tmp_file, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=chunk_size):
-                        if chunk:
-                            f.write(chunk)
-                            file_hash.update(chunk)
-                            cumulative += len(chunk)
-                            _whisper_tracker.update(
-                                cumulative, adjusted_total, fname
-                            )
-                    f.flush()
-
-            actual_hash = file_hash.hexdigest()
-            logger.info("Whisper %s SHA-256: %s", fname, actual_hash)
-
-            if expected_sha and actual_hash != expected_sha.lower():
-                tmp_file.unlink(missing_ok=True)
-                raise ValueError(
-                    f"SHA-256 mismatch for {fname}: "
-                    f"expected {expected_sha}, got {actual_hash}"
-                )
-
-            tmp_file.replace(dest_file)
-            logger.info("Whisper file complete: %s", fname)
+                    sizes[i] = file_total
+                _whisper_tracker.update(sum(done), sum(sizes), fname)
+            return on_progress
+
+        slots = asyncio.Semaphore(_WHISPER_PARALLEL_FILES)
+
+        async def fetch(i: int, file_info: dict) -> None:
+            async with slots:
+                await _download_whisper_file(client, file_info, dest_dir, progress_for(i, file_info["name"]))
+
+        async with _download_client(300) as client:
+            tasks = [asyncio.ensure_future(fetch(i, f)) for i, f in enumerate(WHISPER_MODEL_FILES)]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # One file failed: stop the others (they remove their .part)
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
 
         _whisper_tracker.finish()
         _check_models_cache["ts"] = 0.0
+        _health_cache["ts"] = 0.0
         logger.info("Whisper model download complete: %s", dest_dir)
 
     except Exception as exc:
@@ -387,24 +554,38 @@ def _get_recommendation_note(profile: str) -> str:
 
 @router.get("/check-models")
 async def check_models():
-    now = time.monotonic()
-    if (
-        _check_models_cache["result"] is not None
-        and (now - _check_models_cache["ts"]) < _CHECK_MODELS_TTL
-    ):
-        return _check_models_cache["result"]
+    cached = _cached_check_models()
+    if cached is not None:
+        return cached
+
+    async with _check_models_lock:
+        # Another request may have refreshed it while we waited
+        cached = _cached_check_models()
+        if cached is not None:
+            return cached
 
-    hw_info = get_hardware_info()
+        now = time.monotonic()
+        result = await _build_check_models()
+        _check_models_cache["result"] = result
+        _check_models_cache["ts"] = now
+        return result
+
+
+async def _build_check_models() -> dict:
+    hw_info = await asyncio.to_thread(get_hardware_info)
     profile = hw_info["profile"]
     cfg = MODEL_CONFIGS[profile]
     model_path = get_llm_model_path(profile)
     expected_size = cfg.get("size_gb", 0)
 
-    is_valid = _is_model_valid(model_path, expected_size, cfg.get("sha256"))
+    # Validation may hash multi-GB files: keep it off the event loop
+    is_valid, whisper_valid = await asyncio.gather(
+        asyncio.to_thread(_is_model_valid, model_path, expected_size, cfg.get("sha256")),
+        asyncio.to_thread(_is_whisper_valid),
+    )
     alternatives = ALTERNATIVE_MODELS.get(profile, [])
-    whisper_valid = _is_whisper_valid()
 
-    result = {
+    return {
         "hardware_profile": profile,
         "is_downloaded": is_valid,
         "model_exists": is_valid,
@@ -423,10 +604,6 @@ async def check_models():
         "model_recommendation_note": _get_recommendation_note(profile),
     }
 
-    _check_models_cache["result"] = result
-    _check_models_cache["ts"] = now
-    return result
-
 
 @router.post("/download-model", dependencies=[Depends(verify_api_key)])
 async def download_model(background_tasks: BackgroundTasks):
@@ -440,7 +617,7 @@ async def download_model(background_tasks: BackgroundTasks):
 
     expected_sha256 = cfg.get("sha256")
 
-    if _is_model_valid(model_path, expected_size, expected_sha256):
+    if await asyncio.to_thread(_is_model_valid, model_path, expected_size, expected_sha256):
         return {"status": "already_exists"}
 
     if not _llm_tracker.try_start():
@@ -458,31 +635,8 @@ async def download_model(background_tasks: BackgroundTasks):
 @router.get("/download-progress")
 async def download_progress():
     """SSE endpoint streaming LLM download progress."""
-
-    async def event_stream():
-        while True:
-            snap = _llm_tracker.snapshot()
-
-            if snap["error"]:
-                yield f"data: {json.dumps({'error': snap['error']})}\n\n"
-                return
-
-            payload = {
-                "progress": snap["progress"],
-                "downloaded_bytes": snap["downloaded_bytes"],
-                "total_bytes": snap["total_bytes"],
-            }
-
-            if snap["done"]:
-                payload["done"] = True
-                yield f"data: {json.dumps(payload)}\n\n"
-                return
-
-            yield f"data: {json.dumps(payload)}\n\n"
-            await asyncio.sleep(1)
-
     return StreamingResponse(
-        event_stream(),
+        _progress_stream(_llm_tracker, False),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -498,7 +652,7 @@ async def download_whisper(background_tasks: BackgroundTasks):
     if _whisper_tracker.is_active:
         return {"status": "already_downloading"}
 
-    if _is_whisper_valid():
+    if await asyncio.to_thread(_is_whisper_valid):
         return {"status": "already_exists"}
 
     if not _whisper_tracker.try_start():
@@ -508,35 +662,24 @@ async def download_whisper(background_tasks: BackgroundTasks):
     return {"status": "started"}
 
 
-@router.get("/whisper-download-progress")
-async def whisper_download_progress():
-    """SSE endpoint streaming Whisper download progress."""
-
-    async def event_stream():
-        while True:
-            snap = _whisper_tracker.snapshot()
-
-            if snap["error"]:
-                yield f"data: {json.dumps({'error': snap['error']})}\n\n"
-                return
+@router.post("/reload-model", dependencies=[Depends(verify_api_key)])
+async def reload_model():
+    """Load the freshly downloaded LLM in place of the one in memory."""
+    if _llm_tracker.is_active:
+        return {"status": "download_in_progress"}
 
-            payload = {
-                "progress": snap["progress"],
-                "downloaded_bytes": snap["downloaded_bytes"],
-                "total_bytes": snap["total_bytes"],
-                "current_file": snap["current_file"],
-            }
+    from app.llm.local_llm import LocalLLM
 
-            if snap["done"]:
-                payload["done"] = True
-                yield f"data: {json.dumps(payload)}\n\n"
-                return
+    await LocalLLM().reload()
+    _check_models_cache["ts"] = 0.0
+    return {"status": "reloaded"}
 
-            yield f"data: {json.dumps(payload)}\n\n"
-            await asyncio.sleep(1)
 
+@router.get("/whisper-download-progress")
+async def whisper_download_progress():
+    """SSE endpoint streaming Whisper download progress."""
     return StreamingResponse(
-        event_stream(),
+        _progress_stream(_whisper_tracker, True),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
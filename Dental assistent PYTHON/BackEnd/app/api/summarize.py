@@ -5,25 +5,25 @@ POST /summarize         — generate complete SmartNote
 POST /summarize-stream  — stream SmartNote generation via SSE
 """
 
-import json
 import logging
 import threading
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from app.config import get_llm_model_path
+from app.config import is_llm_model_ready
 from app.llm_config import SMARTNOTE_PROMPT_OPTIMIZED
-from app.sanitize import sanitize_input
+from app.sanitize import MAX_TEXT_CHARS, sanitize_input
 from app.security import verify_api_key
+from app.sse import SSE_DONE, SSE_HEADERS, coalesce_tokens, sse_chunk, sse_event
 
 router = APIRouter()
 logger = logging.getLogger("dental_assistant.summarize")
 
 
 class SummaryRequest(BaseModel):
-    text: str
+    text: str = Field(max_length=MAX_TEXT_CHARS)
 
 
 @router.post("/summarize", dependencies=[Depends(verify_api_key)])
@@ -32,7 +32,7 @@ async def summarize(req: SummaryRequest):
     Generate a SmartNote summary from transcribed text.
     Returns the complete summary when generation is finished.
     """
-    if not get_llm_model_path().exists():
+    if not is_llm_model_ready():
         raise HTTPException(status_code=503, detail="Model not downloaded. Please run setup.")
 
     sanitized_text = sanitize_input(req.text)
@@ -58,7 +58,7 @@ async def summarize_stream(req: SummaryRequest, request: Request):
     - data: {"chunk": "token text"}  — for each generated token
     - data: [DONE]                   — when generation is complete
     """
-    if not get_llm_model_path().exists():
+    if not is_llm_model_ready():
         raise HTTPException(status_code=503, detail="Model not downloaded. Please run setup.")
 
     sanitized_text = sanitize_input(req.text)
@@ -73,22 +73,18 @@ async def summarize_stream(req: SummaryRequest, request: Request):
 
     async def event_generator():
         try:
-            async for chunk in llm.generate_stream(prompt, cancel_event=cancel):
+            async for chunk in coalesce_tokens(llm.generate_stream(prompt, cancel_event=cancel)):
                 if await request.is_disconnected():
                     cancel.set()
                     break
-                yield f"data: {json.dumps({'chunk': chunk})}\n\n"
-            yield "data: [DONE]\n\n"
+                yield sse_chunk(chunk)
+            yield SSE_DONE
         except Exception as e:
             logger.exception("Streaming error")
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            yield sse_event({"error": str(e)})
 
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+        headers=SSE_HEADERS,
     )
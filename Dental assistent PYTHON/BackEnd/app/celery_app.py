@@ -0,0 +1,155 @@
+"""
+Optional Celery offload for the worker pools.
+
+When CELERY_BROKER_URL is set (and celery is installed), WorkerPool.run()
+sends work for the pools listed in CELERY_POOLS to Celery instead of the
+local thread executor.  Each pool name is also the Celery queue name, so
+GPU hosts can take transcription and CPU hosts retrieval:
+
+    celery -A app.celery_app worker -Q whisper   # GPU hosts
+    celery -A app.celery_app worker -Q rag       # CPU hosts
+
+Callers don't change: the callable passed to worker_pool.run() is shipped
+by name (``Class.method``, resolved against that backend singleton inside
+the Celery worker).  Only the stateless jobs in _REMOTE_JOBS are shipped —
+transcription and RAG-context retrieval over the seeded knowledge base.
+Consultation saves and consultation searches always run in-process on the
+API host, which owns the consultation journal and its Chroma collection; a
+worker has its own store and would answer searches from stale or empty
+data.  Everything else (lambdas, closures, other methods) and every pool
+not in CELERY_POOLS also keeps running in-process.
+
+Workers load the RAG pipeline at startup only when they consume the "rag"
+queue, so whisper-only GPU workers don't load the embedder and Chroma.
+
+Arguments and results travel as JSON.  Whisper jobs pass the path of the
+uploaded audio file, so whisper workers must see the API host's temp
+directory (shared volume) — otherwise leave "whisper" out of CELERY_POOLS.
+"""
+
+import logging
+import os
+from typing import Any, Callable
+
+logger = logging.getLogger("dental_assistant.celery")
+
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "")
+_CELERY_POOLS = frozenset(p.strip() for p in os.getenv("CELERY_POOLS", "whisper,rag").split(",") if p.strip())
+
+
+# ---------------------------------------------------------------------------
+# Singletons whose methods can be shipped by name
+# ---------------------------------------------------------------------------
+
+def _rag_pipeline():
+    from app.rag.pipelines import get_rag_pipeline
+    return get_rag_pipeline()
+
+
+def _whisper():
+    from app.llm.whisper import LocalWhisper
+    return LocalWhisper()  # loads its model on the first job
+
+
+_INSTANCES: dict[str, Callable[[], Any]] = {
+    "DentalRAGPipeline": _rag_pipeline,
+    "LocalWhisper": _whisper,
+}
+
+# Jobs that give the same answer on any host.  Consultation search/save are
+# deliberately absent: they must hit the API host's own journal and store.
+_REMOTE_JOBS = frozenset({
+    "DentalRAGPipeline.get_rag_context",
+    "LocalWhisper._transcribe_sync",
+})
+
+
+def _target_name(fn: Callable[..., Any]) -> str | None:
+    """Return the name a Celery worker can resolve *fn* from, or None."""
+    owner = getattr(fn, "__self__", None)
+    if owner is None:
+        return None
+    name = f"{type(owner).__name__}.{fn.__name__}"
+    return name if name in _REMOTE_JOBS else None
+
+
+def _resolve(target: str) -> Callable[..., Any]:
+    if target not in _REMOTE_JOBS:
+        raise ValueError(f"Job {target!r} is not allowed to run remotely")
+    cls, _, method = target.partition(".")
+    return getattr(_INSTANCES[cls](), method)
+
+
+def _serves_rag(queues: Any) -> bool:
+    """True if a worker started with ``-Q queues`` consumes the "rag" queue."""
+    if not queues:  # no -Q: default queue, keep the old behaviour
+        return True
+    if isinstance(queues, str):
+        queues = queues.split(",")
+    return "rag" in {q.strip() for q in queues}
+
+
+# ---------------------------------------------------------------------------
+# Celery app (None unless configured)
+# ---------------------------------------------------------------------------
+
+def _create_app():
+    if not CELERY_BROKER_URL:
+        return None
+    try:
+        from celery import Celery
+        from celery.signals import celeryd_init, worker_process_init
+    except ImportError:
+        logger.warning("CELERY_BROKER_URL is set but celery is not installed; running jobs in-process")
+        return None
+
+    app = Celery(
+        "dental_assistant",
+        broker=CELERY_BROKER_URL,
+        backend=os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL),
+    )
+    app.conf.update(
+        task_serializer="json",
+        result_serializer="json",
+        accept_content=["json"],
+        # Jobs are seconds long: don't let one worker hoard a backlog
+        worker_prefetch_multiplier=1,
+        task_acks_late=True,
+    )
+
+    @app.task(name="dental_assistant.run_job")
+    def run_job(target: str, args: list) -> Any:
+        return _resolve(target)(*args)
+
+    # celeryd_init fires in the parent before the pool forks, so children
+    # inherit the flag.
+    worker_state = {"serves_rag": True}
+
+    @celeryd_init.connect
+    def _note_queues(options: dict | None = None, **_: Any) -> None:
+        worker_state["serves_rag"] = _serves_rag((options or {}).get("queues"))
+
+    @worker_process_init.connect
+    def _init_worker(**_: Any) -> None:
+        if not worker_state["serves_rag"]:
+            return
+        from app.api.rag import initialize_rag
+        initialize_rag()
+
+    return app
+
+
+celery = _create_app()
+
+
+def celery_target(pool_name: str, fn: Callable[..., Any]) -> str | None:
+    """Return the job name to send *fn* to Celery under, or None to run it locally."""
+    if celery is None or pool_name not in _CELERY_POOLS:
+        return None
+    return _target_name(fn)
+
+
+def run_remote(target: str, args: tuple, queue: str, timeout: float) -> Any:
+    """Send a job to *queue* and block until its result arrives (run in a thread)."""
+    result = celery.tasks["dental_assistant.run_job"].apply_async(args=(target, list(args)), queue=queue)
+    return result.get(timeout=timeout)
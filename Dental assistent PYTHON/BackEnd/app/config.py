@@ -2,6 +2,7 @@ import os
 import sys
 import logging
 import threading
+import time
 from pathlib import Path
 from typing import Tuple, Optional, Dict, Any
 from .platform import get_platform
@@ -109,6 +110,7 @@ class HardwareDetector:
             "vram_gb": float | None,
             "backend_gpu_support": bool,
             "detection_method": str,
+            "cpu_int8_dot": bool,
         }
         """
         # Quick check without lock for already cached result
@@ -128,6 +130,7 @@ class HardwareDetector:
                 "vram_gb": None,
                 "backend_gpu_support": False,
                 "detection_method": "none",
+                "cpu_int8_dot": False,
             }
 
             # Tier 1: Detect GPU driver
@@ -139,6 +142,7 @@ class HardwareDetector:
             # Tier 2: Check if llama-cpp-python has GPU support
             backend_support = cls._check_backend_gpu_support()
             result["backend_gpu_support"] = backend_support
+            result["cpu_int8_dot"] = cls._check_cpu_int8_dot()
 
             # Tier 3: Determine profile based on detection
             if result["gpu_detected"] and result["backend_gpu_support"]:
@@ -169,6 +173,15 @@ class HardwareDetector:
         return platform.detect_gpu()
 
 
+    @classmethod
+    def _check_cpu_int8_dot(cls) -> bool:
+        """Check for int8 dot-product CPU instructions (sizes CPU prompt batches)."""
+        try:
+            return get_platform().check_cpu_int8_dot()
+        except Exception as e:
+            logger.debug("CPU int8 dot-product check failed: %s", e)
+            return False
+
     @classmethod
     def _check_backend_gpu_support(cls) -> bool:
         """Check if llama-cpp-python was built with GPU support."""
@@ -348,3 +361,20 @@ def get_llm_model_path(profile: str = None) -> Path:
         profile = analyze_hardware()
     cfg = MODEL_CONFIGS.get(profile) or MODEL_CONFIGS["cpu_only"]
     return MODELS_DIR / cfg["filename"]
+
+
+# The summarize endpoints check for the model file on every request; the
+# answer is reused for a few seconds (setup clears it after a download).
+_model_ready_cache: Dict[str, Any] = {"ok": False, "ts": 0.0}
+_MODEL_READY_TTL = 5.0  # seconds
+
+
+def is_llm_model_ready() -> bool:
+    """Whether the LLM model file for the current profile is on disk (cached briefly)."""
+    now = time.monotonic()
+    if now - _model_ready_cache["ts"] < _MODEL_READY_TTL:
+        return _model_ready_cache["ok"]
+    ok = get_llm_model_path().exists()
+    _model_ready_cache["ok"] = ok
+    _model_ready_cache["ts"] = now
+    return ok
@@ -19,7 +19,8 @@ from dataclasses import dataclass, field
 from typing import Optional
 
 from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
+
+from app.responses import FastJSONResponse
 
 logger = logging.getLogger("dental_assistant.errors")
 
@@ -169,7 +170,7 @@ class AppError(HTTPException):
 # Global exception handlers (register on the FastAPI app)
 # ---------------------------------------------------------------------------
 
-async def app_error_handler(_request: Request, exc: AppError) -> JSONResponse:
+async def app_error_handler(_request: Request, exc: AppError) -> FastJSONResponse:
     """Handle ``AppError`` and return a structured JSON body."""
     body = exc._build_detail_dict()
     logger.warning(
@@ -179,10 +180,10 @@ async def app_error_handler(_request: Request, exc: AppError) -> JSONResponse:
         exc._detail or "",
         exc.request_id,
     )
-    return JSONResponse(status_code=exc.error_def.http_status, content=body)
+    return FastJSONResponse(status_code=exc.error_def.http_status, content=body)
 
 
-async def generic_http_handler(_request: Request, exc: HTTPException) -> JSONResponse:
+async def generic_http_handler(_request: Request, exc: HTTPException) -> FastJSONResponse:
     """
     Catch any plain ``HTTPException`` that wasn't wrapped in ``AppError``
     and normalise the response to the same JSON shape.
@@ -193,10 +194,10 @@ async def generic_http_handler(_request: Request, exc: HTTPException) -> JSONRes
         "detail": exc.detail if not isinstance(exc.detail, str) else None,
         "request_id": uuid.uuid4().hex[:12],
     }
-    return JSONResponse(status_code=exc.status_code, content=body)
+    return FastJSONResponse(status_code=exc.status_code, content=body)
 
 
-async def unhandled_error_handler(_request: Request, exc: Exception) -> JSONResponse:
+async def unhandled_error_handler(_request: Request, exc: Exception) -> FastJSONResponse:
     """
     Last-resort handler for truly unexpected errors.
     Logs the full traceback and returns a safe message to the client.
@@ -209,4 +210,4 @@ async def unhandled_error_handler(_request: Request, exc: Exception) -> JSONResp
         "detail": None,
         "request_id": request_id,
     }
-    return JSONResponse(status_code=500, content=body)
+    return FastJSONResponse(status_code=500, content=body)
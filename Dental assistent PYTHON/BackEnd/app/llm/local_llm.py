@@ -13,12 +13,17 @@ from app.llm_config import (
     CONTEXT_LENGTH,
     CPU_THREADS,
     BATCH_SIZES,
+    CPU_INT8_DOT_BATCH_SIZE,
+    N_BATCH_OVERRIDE,
+    N_UBATCH,
     GPU_LAYERS,
     GPU_LAYERS_APPLE_SILICON,
     GENERATION_PARAMS,
     STOP_TOKENS,
     MAX_GENERATION_TOKENS,
     MEMORY_CONFIG,
+    PROMPT_CACHE_MB,
+    SMARTNOTE_PROMPT_PREFIX,
     CHUNKING_THRESHOLD,
     CHUNK_SIZE_TOKENS,
     CHUNK_SUMMARY_PROMPT,
@@ -115,13 +120,15 @@ class LocalLLM:
 
     Features:
     - No heavy imports at module import time
-    - Lazy model loading with hardware detection
+    - Lazy model loading with hardware detection (preloaded at startup when
+      the model is present, hot-swappable via reload() after a download)
     - Automatic GPU layer offloading based on detected hardware
     - Priority-aware concurrency gate (configurable via LLM_CONCURRENCY env var)
     - Cancellation support for streaming generation
     - Thread-safe initialization
     - Streaming support for reduced perceived latency
     - Optimized memory configuration
+    - SmartNote instruction prefix prefilled once after loading
     - Queue status tracking for UX feedback
     """
 
@@ -140,6 +147,8 @@ class LocalLLM:
                     max_concurrency = int(os.environ.get("LLM_CONCURRENCY", "1"))
                     cls._instance._gate = _InferenceGate(max_concurrency)
                     cls._instance._hw_profile = None
+                    # prompt -> running generation, shared by identical requests
+                    cls._instance._inflight: dict[str, asyncio.Task] = {}
         return cls._instance
 
     def get_queue_status(self) -> dict:
@@ -169,8 +178,11 @@ class LocalLLM:
             gpu_layers = 0
 
         n_batch = BATCH_SIZES.get(profile, 256)
+        if gpu_layers == 0 and hw_info.get("cpu_int8_dot"):
+            n_batch = max(n_batch, CPU_INT8_DOT_BATCH_SIZE)
+        n_batch = N_BATCH_OVERRIDE or n_batch
 
-        return {
+        config = {
             "n_ctx": CONTEXT_LENGTH,
             "n_threads": CPU_THREADS,
             "n_gpu_layers": gpu_layers,
@@ -179,6 +191,9 @@ class LocalLLM:
             "use_mmap": MEMORY_CONFIG["use_mmap"],
             "verbose": False,
         }
+        if N_UBATCH:
+            config["n_ubatch"] = min(N_UBATCH, n_batch)
+        return config
 
     def _load_model_if_needed(self) -> None:
         if self._llm is not None:
@@ -219,7 +234,75 @@ class LocalLLM:
                     config["n_threads"],
                 )
 
-            self._llm = Llama(model_path=str(model_path), **config)
+            llm = Llama(model_path=str(model_path), **config)
+            self._warm_prompt_cache(llm)
+            self._llm = llm
+
+    def _warm_prompt_cache(self, llm) -> None:
+        """
+        Prefill the SmartNote instruction prefix right after loading.
+
+        llama-cpp-python reuses the longest token prefix shared with the
+        previous prompt, so this only spares the first SmartNote the prefix
+        prefill.  With LLM_PROMPT_CACHE_MB > 0 the prefix state also goes
+        into a LlamaRAMCache, which keeps it across unrelated prompts at the
+        memory and per-request costs noted in llm_config.
+        """
+        try:
+            tokens = llm.tokenize(SMARTNOTE_PROMPT_PREFIX.encode("utf-8"), special=True)
+            llm.reset()
+            llm.eval(tokens)
+            if PROMPT_CACHE_MB > 0:
+                from llama_cpp import LlamaRAMCache  # type: ignore
+
+                llm.set_cache(LlamaRAMCache(capacity_bytes=PROMPT_CACHE_MB * 1024 * 1024))
+                llm.cache[tokens] = llm.save_state()
+            logger.info("SmartNote prompt prefix prefilled (%d tokens)", len(tokens))
+        except Exception:
+            # Generation still works, it just prefills the full prompt
+            logger.warning("Could not prefill the SmartNote prompt prefix", exc_info=True)
+
+    async def _ensure_loaded(self) -> None:
+        """Load the model off the event loop if the startup preload hasn't."""
+        if self._llm is None:
+            await asyncio.to_thread(self._load_model_if_needed)
+
+    def preload(self) -> bool:
+        """
+        Load the model now so the first request doesn't pay for it.
+
+        Blocking — run it in a thread.  Never raises: a missing model or
+        llama-cpp-python just leaves loading to the first request.
+        """
+        try:
+            self._load_model_if_needed()
+            return True
+        except HTTPException as e:
+            logger.info("LLM not preloaded: %s", e.detail)
+        except Exception:
+            logger.exception("LLM preload failed")
+        return False
+
+    async def reload(self, timeout: Optional[float] = None) -> None:
+        """
+        Swap in the current model file (e.g. after /setup/download-model).
+
+        Takes every inference slot first, so no generation is running on the
+        old model while it is released and the new one loads.
+        """
+        timeout = timeout or self.DEFAULT_QUEUE_TIMEOUT
+        held = 0
+        try:
+            for _ in range(self._gate._max):
+                await self._gate.acquire(priority=PRIORITY_INTERACTIVE, timeout=timeout)
+                held += 1
+            with self._load_lock:
+                # Free the old weights first: there is rarely room for two models
+                self._llm = None
+            await asyncio.to_thread(self._load_model_if_needed)
+        finally:
+            for _ in range(held):
+                await self._gate.release()
 
     def _estimate_tokens(self, text: str) -> int:
         """Rough token estimation: ~3 characters per token for French/multilingual text."""
@@ -260,8 +343,25 @@ class LocalLLM:
         Generate text from the local LLM (batch priority).
 
         Uses PRIORITY_BATCH so interactive streaming requests take precedence.
+        Identical prompts already in flight (double-clicks, client retries)
+        share one generation instead of queueing a second one.
         """
-        self._load_model_if_needed()
+        task = self._inflight.get(prompt)
+        if task is None:
+            task = asyncio.ensure_future(self._generate(prompt, timeout))
+            self._inflight[prompt] = task
+            task.add_done_callback(lambda t: self._generation_done(prompt, t))
+        # A caller that goes away must not cancel the others' generation
+        return await asyncio.shield(task)
+
+    def _generation_done(self, prompt: str, task: asyncio.Task) -> None:
+        if self._inflight.get(prompt) is task:
+            del self._inflight[prompt]
+        if not task.cancelled():
+            task.exception()  # retrieved here even if every caller went away
+
+    async def _generate(self, prompt: str, timeout: Optional[float]) -> str:
+        await self._ensure_loaded()
         timeout = timeout or self.DEFAULT_QUEUE_TIMEOUT
 
         await self._gate.acquire(priority=PRIORITY_BATCH, timeout=timeout)
@@ -290,7 +390,7 @@ class LocalLLM:
             timeout: Maximum time to wait in queue (default: 5 minutes)
             cancel_event: If set externally, generation stops early
         """
-        self._load_model_if_needed()
+        await self._ensure_loaded()
         timeout = timeout or self.DEFAULT_QUEUE_TIMEOUT
 
         await self._gate.acquire(
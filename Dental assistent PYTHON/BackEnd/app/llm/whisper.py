@@ -95,11 +95,13 @@ class LocalWhisper:
         """
         Runs transcription in the 'whisper' worker pool (bounded concurrency).
 
+        The model is loaded by whichever process runs the job, so with Celery
+        offload the API host never loads it.
+
         Args:
             audio_path: Path to the audio file
             language: Language code (e.g. "fr", "en"). Defaults to WHISPER_DEFAULT_LANGUAGE.
         """
-        self._load_model_if_needed()
         lang = language or WHISPER_DEFAULT_LANGUAGE
 
         from app.worker import WorkerPool
@@ -115,7 +117,7 @@ class LocalWhisper:
         - Language hint avoids detection overhead
         - condition_on_previous_text=False for speed
         """
-        assert self._model is not None  # guaranteed by _load_model_if_needed()
+        self._load_model_if_needed()
 
         segments, info = self._model.transcribe(
             audio_path,
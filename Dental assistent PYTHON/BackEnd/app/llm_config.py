@@ -81,6 +81,16 @@ BATCH_SIZES = {
     "cpu_only": 128,    # CPU: batch minimal pour eviter saturation
 }
 
+# CPU avec instructions int8 (AVX-VNNI / AVX512-VNNI / Arm dotprod): les
+# noyaux quantifies de llama.cpp traitent le prompt bien plus vite, un
+# batch plus grand est donc rentable meme sans GPU
+CPU_INT8_DOT_BATCH_SIZE = 512
+
+# Surcharges optionnelles (LLM_N_BATCH remplace BATCH_SIZES; LLM_N_UBATCH
+# fixe le micro-batch physique, sinon valeur par defaut de llama.cpp)
+N_BATCH_OVERRIDE = int(os.getenv("LLM_N_BATCH", "0"))
+N_UBATCH = int(os.getenv("LLM_N_UBATCH", "0"))
+
 # GPU layers pour Llama-3-8B (32 layers total + embeddings)
 GPU_LAYERS = {
     "high_vram": 33,    # Toutes les couches sur GPU
@@ -139,8 +149,10 @@ WHISPER_WORKERS = {
 # ============================================
 
 MEMORY_CONFIG = {
-    "use_mlock": True,   # Verrouille modele en RAM (evite swap)
-    "use_mmap": True,    # Memory-mapped loading (chargement efficace)
+    # Verrouiller le modele en RAM (evite swap) force a tout charger et
+    # echoue au-dela de RLIMIT_MEMLOCK: opt-in via LLM_MLOCK=1
+    "use_mlock": os.getenv("LLM_MLOCK", "0") == "1",
+    "use_mmap": True,    # Memory-mapped loading: poids lus via le page cache, pas copies
 }
 
 
@@ -170,6 +182,17 @@ SMARTNOTE_PROMPT_OPTIMIZED = _llama3_prompt(
     ),
 )
 
+# Everything before the transcription is identical for every SmartNote:
+# LocalLLM prefills it once after loading, and llama.cpp's prefix reuse
+# then only evaluates the transcription.
+SMARTNOTE_PROMPT_PREFIX = SMARTNOTE_PROMPT_OPTIMIZED.partition("{text}")[0]
+
+# Cache de prompts llama.cpp (etats KV) en Mo, desactive par defaut (0).
+# Cout: jusqu'a cette taille de RAM reste occupee, et llama-cpp-python
+# copie tout l'etat KV (plusieurs centaines de Mo avec n_ctx=4096) apres
+# CHAQUE generation.  Utile seulement si des prompts differents alternent.
+PROMPT_CACHE_MB = int(os.getenv("LLM_PROMPT_CACHE_MB", "0"))
+
 CHUNK_SUMMARY_PROMPT = _llama3_prompt(
     system=(
         "Tu es un assistant dentaire. "
@@ -34,10 +34,19 @@ class MaxRequestSizeMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, max_bytes: int = 10 * 1024 * 1024):
         super().__init__(app)
         self.max_bytes = max_bytes
+        # A plain decimal Content-Length with fewer digits than max_bytes is
+        # necessarily smaller, so most requests never need an int() parse.
+        self._max_bytes_digits = len(str(max_bytes))
 
     async def dispatch(self, request: Request, call_next):
         content_length = request.headers.get("content-length")
         if content_length is not None:
+            if (
+                len(content_length) < self._max_bytes_digits
+                and content_length.isascii()
+                and content_length.isdigit()
+            ):
+                return await call_next(request)
             try:
                 if int(content_length) > self.max_bytes:
                     logger.warning(
@@ -7,6 +7,8 @@ Provides:
 - MetricsCollector          — singleton that tracks request counts, latency percentiles,
                               error counts by endpoint, and a ring buffer of recent errors.
 - get_metrics()             — snapshot for the GET /metrics endpoint.
+- current_request_id()      — X-Request-ID of the request being served (also
+                              inside worker-pool threads, see app.worker).
 - Error-report helpers      — pending errors queue so the frontend can prompt the user
                               to optionally send bug reports to the developer.
 
@@ -14,12 +16,12 @@ No external services required — everything lives in-process.
 """
 
 import bisect
+import contextvars
 import logging
 import os
+import random
+import sys
 import time
-import uuid
-from collections import defaultdict, deque
-from dataclasses import dataclass, field
 from threading import Lock
 from typing import Any
 
@@ -35,24 +37,64 @@ _ERROR_BUFFER_SIZE = int(os.getenv("ERROR_BUFFER_SIZE", "50"))
 # Maximum number of latency samples per endpoint (for percentile calculation)
 _MAX_LATENCY_SAMPLES = 500
 
+# Field order of the error tuples stored in the ring buffer / pending queue.
+# Records stay as plain tuples on the hot path and are only turned into dicts
+# when somebody asks for them (snapshot, error-report endpoints).
+_ERROR_FIELDS = ("error_id", "timestamp", "request_id", "method", "path", "status", "detail")
+
+# Request/error IDs only need to be unique enough to correlate log lines, so
+# they come from a PRNG seeded once at import rather than uuid4() (which
+# reads os.urandom on every call).
+_rng = random.Random()
+# Pre-fork servers (gunicorn --preload) copy this state into every worker;
+# reseed in the child so workers don't hand out the same IDs
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_rng.seed)
+_monotonic = time.monotonic
+
+# Set by RequestTracingMiddleware for the duration of each request
+_request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_id", default=None)
+
+
+def current_request_id() -> str | None:
+    """Return the X-Request-ID of the request being handled, if any."""
+    return _request_id.get()
+
+
+def _new_id(hex_digits: int) -> str:
+    """Return a random lowercase hex ID of the given length."""
+    return f"{_rng.getrandbits(hex_digits * 4):0{hex_digits}x}"
+
+
+def _incoming_request_id(scope: dict) -> str | None:
+    """Return the client-supplied X-Request-ID straight from the raw ASGI headers."""
+    for name, value in scope["headers"]:
+        if name == b"x-request-id":
+            return value.decode("latin-1") or None
+    return None
+
 
 # ---------------------------------------------------------------------------
-# MetricsCollector (singleton)
+# MetricsCollector (module-level singleton)
 # ---------------------------------------------------------------------------
 
-@dataclass
 class _EndpointStats:
-    """Per-endpoint aggregated stats."""
-    request_count: int = 0
-    error_count: int = 0          # status >= 500
-    client_error_count: int = 0   # 400 <= status < 500
-    total_latency_ms: float = 0.0
-    latencies: list[float] = field(default_factory=list)  # sorted samples for percentiles
+    """Per-endpoint aggregated stats (slotted: touched on every request)."""
 
+    __slots__ = ("request_count", "error_count", "client_error_count", "total_latency_ms", "latencies")
 
-class MetricsCollector:
+    def __init__(self) -> None:
+        self.request_count = 0
+        self.error_count = 0             # status >= 500
+        self.client_error_count = 0      # 400 <= status < 500
+        self.total_latency_ms = 0.0
+        self.latencies: list[float] = []  # sorted samples for percentiles
+
+
+class _MetricsCollector:
     """
-    In-process metrics collector.  Thread-safe, singleton.
+    In-process metrics collector.  Thread-safe; one instance per process
+    (see MetricsCollector() below).
 
     Tracks:
     - Per-endpoint: request count, error count, latency percentiles (p50/p95/p99)
@@ -60,24 +102,20 @@ class MetricsCollector:
     - Recent errors: ring buffer with timestamp, path, status, request_id, detail
     """
 
-    _instance = None
-    _init_lock = Lock()
-
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._init_lock:
-                if cls._instance is None:
-                    inst = super().__new__(cls)
-                    inst._lock = Lock()
-                    inst._endpoints: dict[str, _EndpointStats] = defaultdict(_EndpointStats)
-                    inst._recent_errors: deque[dict[str, Any]] = deque(maxlen=_ERROR_BUFFER_SIZE)
-                    # Errors the frontend hasn't acted on yet, keyed by error_id
-                    inst._pending_errors: dict[str, dict[str, Any]] = {}
-                    inst._start_time = time.monotonic()
-                    inst._total_requests = 0
-                    inst._active_requests = 0
-                    cls._instance = inst
-        return cls._instance
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._endpoints: dict[str, _EndpointStats] = {}
+        # (method, path) -> interned "METHOD path" key, so the hot path
+        # doesn't build a fresh key string for every request
+        self._key_cache: dict[tuple[str, str], str] = {}
+        # Preallocated ring of error tuples; _err_head is the next slot to overwrite
+        self._recent_errors: list[tuple | None] = [None] * _ERROR_BUFFER_SIZE
+        self._err_head = 0
+        # Errors the frontend hasn't acted on yet, keyed by error_id
+        self._pending_errors: dict[str, tuple] = {}
+        self._start_time = _monotonic()
+        self._total_requests = 0
+        self._active_requests = 0
 
     # ----- recording -----
 
@@ -98,8 +136,12 @@ class MetricsCollector:
             self._active_requests = max(0, self._active_requests - 1)
             self._total_requests += 1
 
-            key = f"{method} {path}"
-            stats = self._endpoints[key]
+            key = self._key_cache.get((method, path))
+            if key is None:
+                key = self._key_cache[(method, path)] = sys.intern(f"{method} {path}")
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = _EndpointStats()
             stats.request_count += 1
             stats.total_latency_ms += latency_ms
 
@@ -114,17 +156,13 @@ class MetricsCollector:
 
             if status_code >= 500:
                 stats.error_count += 1
-                error_id = uuid.uuid4().hex[:10]
-                error_record = {
-                    "error_id": error_id,
-                    "timestamp": time.time(),
-                    "request_id": request_id,
-                    "method": method,
-                    "path": path,
-                    "status": status_code,
-                    "detail": detail[:500],
-                }
-                self._recent_errors.append(error_record)
+                error_id = _new_id(10)
+                error_record = (
+                    error_id, time.time(), request_id, method, path, status_code, detail[:500],
+                )
+                if _ERROR_BUFFER_SIZE:
+                    self._recent_errors[self._err_head] = error_record
+                    self._err_head = (self._err_head + 1) % _ERROR_BUFFER_SIZE
                 self._pending_errors[error_id] = error_record
             elif 400 <= status_code < 500:
                 stats.client_error_count += 1
@@ -134,19 +172,21 @@ class MetricsCollector:
     def get_pending_errors(self) -> list[dict[str, Any]]:
         """Return errors the user hasn't reported or dismissed yet."""
         with self._lock:
-            return list(self._pending_errors.values())
+            records = list(self._pending_errors.values())
+        return [dict(zip(_ERROR_FIELDS, rec)) for rec in records]
 
     def pop_error(self, error_id: str) -> dict[str, Any] | None:
         """Remove and return a pending error (for reporting or dismissing)."""
         with self._lock:
-            return self._pending_errors.pop(error_id, None)
+            record = self._pending_errors.pop(error_id, None)
+        return dict(zip(_ERROR_FIELDS, record)) if record is not None else None
 
     # ----- querying -----
 
     def snapshot(self) -> dict[str, Any]:
         """Return a JSON-serialisable metrics snapshot."""
         with self._lock:
-            uptime_s = time.monotonic() - self._start_time
+            uptime_s = _monotonic() - self._start_time
             endpoints = {}
             for key, stats in self._endpoints.items():
                 endpoints[key] = {
@@ -157,12 +197,17 @@ class MetricsCollector:
                     **self._percentiles(stats.latencies),
                 }
 
+            # Oldest first: the slots from the head onwards were written earliest
+            head = self._err_head
+            ring = self._recent_errors[head:] + self._recent_errors[:head]
+            recent_errors = [dict(zip(_ERROR_FIELDS, rec)) for rec in ring if rec is not None]
+
             return {
                 "uptime_seconds": round(uptime_s, 1),
                 "total_requests": self._total_requests,
                 "active_requests": self._active_requests,
                 "endpoints": endpoints,
-                "recent_errors": list(self._recent_errors),
+                "recent_errors": recent_errors,
             }
 
     @staticmethod
@@ -177,9 +222,18 @@ class MetricsCollector:
         }
 
 
+# Built once at import: callers on the request path just read a global.
+_METRICS = _MetricsCollector()
+
+
+def MetricsCollector() -> _MetricsCollector:
+    """Return the process-wide metrics collector."""
+    return _METRICS
+
+
 def get_metrics() -> dict[str, Any]:
     """Public helper — returns the current metrics snapshot."""
-    return MetricsCollector().snapshot()
+    return _METRICS.snapshot()
 
 
 # ---------------------------------------------------------------------------
@@ -194,12 +248,13 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next) -> Response:
         # Reuse client-provided ID or generate one
-        request_id = request.headers.get("x-request-id") or uuid.uuid4().hex[:12]
+        request_id = _incoming_request_id(request.scope) or _new_id(12)
+        token = _request_id.set(request_id)
 
-        collector = MetricsCollector()
+        collector = _METRICS
         collector.request_started()
 
-        start = time.monotonic()
+        start = _monotonic()
         status_code = 500  # default in case call_next raises
         detail = ""
 
@@ -212,8 +267,8 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
             detail = str(exc)
             raise
         finally:
-            latency_ms = (time.monotonic() - start) * 1000
-            path = request.url.path
+            _request_id.reset(token)
+            latency_ms = (_monotonic() - start) * 1000
             method = request.method
 
             # Structured log line
@@ -221,14 +276,20 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
             log_fn(
                 "%s %s %d %.0fms [%s]",
                 method,
-                path,
+                request.url.path,
                 status_code,
                 latency_ms,
                 request_id,
             )
 
+            # Metrics are keyed by route template ("/errors/{error_id}/report"),
+            # not the raw URL, so the endpoint table stays bounded by the
+            # number of registered routes.
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", None) or "unknown"
+
             collector.request_finished(
-                path=path,
+                path=route_path,
                 method=method,
                 status_code=status_code,
                 latency_ms=latency_ms,
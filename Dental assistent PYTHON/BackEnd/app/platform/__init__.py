@@ -15,6 +15,7 @@ Usage:
 import sys
 import logging
 from typing import Optional
+from . import platform_linux, platform_macos, platform_windows
 from .base import PlatformBase
 from .platform_windows import WindowsPlatform
 from .platform_macos import MacOSPlatform
@@ -59,11 +60,15 @@ def get_platform() -> PlatformBase:
 
 def reset_platform():
     """
-    Reset the platform singleton instance.
+    Reset the platform singleton instance, its cached GPU probes and the
+    cached user data directories (re-reading XDG_DATA_HOME / APPDATA).
     Useful for testing or when platform detection needs to be re-run.
     """
     global _platform_instance
     _platform_instance = None
+    PlatformBase.invalidate_gpu_cache()
+    for module in (platform_linux, platform_macos, platform_windows):
+        module.refresh()
 
 
 # Export public API
@@ -4,21 +4,176 @@ Defines the common interface that all platform classes must implement.
 """
 
 import ctypes
-import glob
+import functools
+import json
 import logging
 import os
+import re
+import shutil
 import subprocess
 import sys
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from ctypes.util import find_library
+from itertools import chain
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Callable, ClassVar, Iterable, Iterator, Tuple, TypeVar
 
 logger = logging.getLogger("dental_assistant.platform")
 
+# Marks a probe cache slot that hasn't been filled yet (None is a valid result)
+_UNSET: Any = object()
+
+# NVML (the library nvidia-smi itself wraps) ships with every NVIDIA driver
+if sys.platform.startswith("win"):
+    _NVML_LIB_NAMES: Tuple[str, ...] = (
+        "nvml.dll",
+        os.path.join(os.getenv("ProgramFiles", r"C:\Program Files"), "NVIDIA Corporation", "NVSMI", "nvml.dll"),
+    )
+elif sys.platform.startswith("linux"):
+    _NVML_LIB_NAMES = ("libnvidia-ml.so.1", "libnvidia-ml.so")
+else:
+    _NVML_LIB_NAMES = ()
+
+
+_T = TypeVar("_T")
+
+
+def cached_probe(attr: str) -> Callable[[Callable[..., _T]], Callable[..., _T]]:
+    """
+    Memoize a zero-argument platform probe on the concrete platform class.
+
+    GPU hardware and the llama-cpp backend don't change while the process
+    runs, so subclasses decorate detect_gpu with this and only the first
+    call does real work. PlatformBase.invalidate_gpu_cache()
+    clears the stored results.
+    """
+    def decorator(method: Callable[..., _T]) -> Callable[..., _T]:
+        @functools.wraps(method)
+        def wrapper(self) -> _T:
+            cls = type(self)
+            cached = getattr(cls, attr)
+            if cached is _UNSET:
+                cached = method(self)
+                setattr(cls, attr, cached)
+            return cached
+        return wrapper
+    return decorator
+
+
+# /proc/cpuinfo flags of int8 dot-product instructions (x86 VNNI, Arm dotprod)
+_INT8_DOT_FLAGS = frozenset({"avx512_vnni", "avx_vnni", "asimddp"})
+
+
+def _cpuinfo_has_int8_dot(cpuinfo: str) -> bool:
+    """Check the first "flags" (x86) / "Features" (Arm) line of /proc/cpuinfo."""
+    for line in cpuinfo.splitlines():
+        if line.startswith(("flags", "Features")):
+            return not _INT8_DOT_FLAGS.isdisjoint(line.partition(":")[2].split())
+    return False
+
+
+def _backend_env() -> Tuple[Optional[str], Optional[str]]:
+    """The environment hints check_gpu_backend_support depends on."""
+    return os.getenv("LLAMA_CUBLAS"), os.getenv("LLAMA_METAL")
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_backend_support(probe: Callable[[], bool], env: Tuple[Optional[str], Optional[str]]) -> bool:
+    """
+    Run a GPU backend probe once per (platform instance, env hints).
+
+    The env hints are part of the key only so that flipping LLAMA_CUBLAS /
+    LLAMA_METAL re-probes; ``env`` itself isn't otherwise used.
+    """
+    return probe()
+
+
+# Vendor CLI probes: hard deadline per invocation, and at most one detection
+# per vendor in flight (nvidia-smi is known to hang, and stacked hung children
+# pile up memory)
+_PROBE_TIMEOUT_S = 1.5
+_NVIDIA_PROBE_LOCK = threading.Lock()
+_AMD_PROBE_LOCK = threading.Lock()
+
+
+# Match both the JSON ("Card series": "Navi 21") and the text
+# (GPU[0] : Card series:    Navi 21) layouts of rocm-smi
+_ROCM_NAME_RE = re.compile(r'Card series"?\s*:\s*"?([^"\n]+)', re.IGNORECASE)
+_ROCM_VRAM_RE = re.compile(r'VRAM Total Memory \(B\)"?\s*:\s*"?(\d+)', re.IGNORECASE)
+
+
+def _run_probe(args: list, timeout: float = _PROBE_TIMEOUT_S) -> Tuple[int, bytes]:
+    """
+    Run a GPU CLI probe and return (returncode, stdout bytes).
+
+    The child is always killed and reaped, even when the deadline expires.
+
+    Raises:
+        FileNotFoundError: the tool isn't installed
+        subprocess.TimeoutExpired: the tool didn't answer in time
+    """
+    proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        stdout, _ = proc.communicate(timeout=timeout)
+        return proc.returncode, stdout
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            try:
+                proc.wait(timeout=0.5)
+            except subprocess.TimeoutExpired:
+                logger.warning("GPU probe %s did not exit after kill", args[0])
+
+
+def _unique_paths(paths: Iterable[str]) -> Iterator[str]:
+    """Yield non-empty paths in order, skipping any already seen."""
+    seen = set()
+    for path in paths:
+        if path and path not in seen:
+            seen.add(path)
+            yield path
+
+
+class _NvmlMemory(ctypes.Structure):
+    """nvmlMemory_t"""
+    _fields_ = [
+        ("total", ctypes.c_ulonglong),
+        ("free", ctypes.c_ulonglong),
+        ("used", ctypes.c_ulonglong),
+    ]
+
 
 class PlatformBase(ABC):
     """Abstract base class for platform-specific operations."""
 
+    # Hardware/runtime probes are process-wide facts (drivers and CUDA
+    # runtimes don't change while we're running), so their results are
+    # cached once on the base class and shared by every platform instance.
+    _cuda_cached: Optional[bool] = None
+    _nvidia_cached: Optional[Dict[str, Any]] = _UNSET
+    _amd_cached: Optional[Dict[str, Any]] = _UNSET
+    _int8_dot_cached: Optional[bool] = None
+
+    # Per-subclass result of detect_gpu (see cached_probe)
+    _gpu_cache: ClassVar[Any] = _UNSET
+
+    @classmethod
+    def invalidate_gpu_cache(cls) -> None:
+        """Forget every cached hardware probe result (GPU, CUDA, CPU int8) so the next call re-detects."""
+        PlatformBase._cuda_cached = None
+        PlatformBase._nvidia_cached = _UNSET
+        PlatformBase._amd_cached = _UNSET
+        PlatformBase._int8_dot_cached = None
+        _cached_backend_support.cache_clear()
+        pending = list(PlatformBase.__subclasses__())
+        while pending:
+            sub = pending.pop()
+            if "_gpu_cache" in sub.__dict__:
+                del sub._gpu_cache
+            pending.extend(sub.__subclasses__())
+
     @abstractmethod
     def get_user_data_dir(self, app_name: str = "DentalAssistant") -> Path:
         """
@@ -80,39 +235,72 @@ class PlatformBase(ABC):
         if os.getenv("LLAMA_CUBLAS") == "1":
             return True
 
-        # Platform-specific library patterns and search paths
-        if sys.platform.startswith("win"):
-            # Windows: cudart64_*.dll (e.g., cudart64_110.dll, cudart64_12.dll)
-            lib_patterns = ["cudart64_*.dll", "cudart*.dll"]
-            search_paths = self._get_windows_cuda_paths()
-        elif sys.platform.startswith("linux"):
-            # Linux: libcudart.so* (e.g., libcudart.so.11, libcudart.so.12)
-            lib_patterns = ["libcudart.so*"]
-            search_paths = self._get_linux_cuda_paths()
-        else:
-            # macOS uses Metal, not CUDA
+        if PlatformBase._cuda_cached is None:
+            PlatformBase._cuda_cached = self._probe_cuda_runtime()
+        return PlatformBase._cuda_cached
+
+    def check_cpu_int8_dot(self) -> bool:
+        """
+        Whether the CPU has int8 dot-product instructions (AVX-VNNI,
+        AVX512-VNNI, Arm dotprod), which llama.cpp's quantized CPU kernels
+        use for much faster prompt processing.
+
+        Read from the CPU flags, without loading llama.cpp.
+        """
+        if PlatformBase._int8_dot_cached is None:
+            PlatformBase._int8_dot_cached = self._probe_cpu_int8_dot()
+        return PlatformBase._int8_dot_cached
+
+    def _probe_cpu_int8_dot(self) -> bool:
+        """Uncached body of check_cpu_int8_dot (Linux /proc/cpuinfo; macOS overrides)."""
+        try:
+            with open("/proc/cpuinfo", encoding="utf-8", errors="replace") as f:
+                return _cpuinfo_has_int8_dot(f.read())
+        except OSError:
+            return False
+
+    def _probe_cuda_runtime(self) -> bool:
+        """Search for and load the CUDA runtime library (uncached)."""
+        # macOS uses Metal, not CUDA
+        if self._cuda_lib_affixes is None:
             return False
+        lib_prefix, lib_suffix = self._cuda_lib_affixes
+
+        # One scandir pass per directory (the path builders already drop
+        # duplicates), matching names with plain string checks
+        for search_path in self._get_cuda_search_paths():
+            try:
+                with os.scandir(search_path) as entries:
+                    matches = [
+                        entry.path for entry in entries
+                        if entry.name.lower().startswith(lib_prefix)
+                        and entry.name.lower().endswith(lib_suffix)
+                    ]
+            except OSError:
+                continue
+            for lib_path in matches:
+                if self._try_load_library(lib_path):
+                    logger.debug("Found CUDA runtime: %s", lib_path)
+                    return True
+
+        # Fallback on Linux: let ctypes resolve whatever libcudart soname the
+        # ldconfig cache knows about (covers ld.so.conf.d dirs we didn't scan
+        # and CUDA versions newer than any hardcoded name)
+        if sys.platform.startswith("linux"):
+            soname = find_library("cudart")
+            if soname and self._try_load_library(soname):
+                logger.debug("Found CUDA runtime via ldconfig: %s", soname)
+                return True
 
-        # Try to find and load CUDA runtime library
-        for search_path in search_paths:
-            for pattern in lib_patterns:
-                full_pattern = os.path.join(search_path, pattern)
-                matches = glob.glob(full_pattern)
-                for lib_path in matches:
-                    if self._try_load_library(lib_path):
-                        logger.debug("Found CUDA runtime: %s", lib_path)
-                        return True
-
-        # Fallback: try loading by name (relies on system PATH/LD_LIBRARY_PATH)
-        fallback_names = self._get_cuda_fallback_names()
-        for lib_name in fallback_names:
+        # Fallback: try loading by name (relies on the system DLL search path)
+        for lib_name in self._cuda_fallback_names:
             if self._try_load_library(lib_name):
                 logger.debug("Found CUDA runtime via fallback: %s", lib_name)
                 return True
 
         return False
 
-    def _get_windows_cuda_paths(self) -> List[str]:
+    def _get_windows_cuda_paths(self) -> Iterator[str]:
         """
         Get common CUDA installation paths on Windows.
 
@@ -146,55 +334,60 @@ class PlatformBase(ABC):
         system_path = os.getenv("PATH", "")
         paths.extend(system_path.split(os.pathsep))
 
-        return paths
+        return _unique_paths(paths)
 
-    def _get_linux_cuda_paths(self) -> List[str]:
+    def _get_linux_cuda_paths(self) -> Iterator[str]:
         """
-        Get common CUDA installation paths on Linux.
+        Yield common CUDA installation paths on Linux, lazily and without duplicates.
 
         Note: These paths are only used for searching - the actual CUDA availability
         is verified by attempting to load the library with ctypes.CDLL.
         """
-        paths = [
-            "/usr/local/cuda/lib64",
-            "/usr/local/cuda/lib",
-            "/usr/lib/x86_64-linux-gnu",
-            "/usr/lib64",
-            "/usr/lib",
-        ]
-
-        # CUDA_PATH environment variable
+        # CUDA_PATH environment variable takes priority
         cuda_path = os.getenv("CUDA_PATH")
-        if cuda_path:
-            paths.insert(0, os.path.join(cuda_path, "lib64"))
-            paths.insert(1, os.path.join(cuda_path, "lib"))
+        cuda_paths = (
+            (os.path.join(cuda_path, "lib64"), os.path.join(cuda_path, "lib"))
+            if cuda_path else ()
+        )
 
         # LD_LIBRARY_PATH
         ld_path = os.getenv("LD_LIBRARY_PATH", "")
-        if ld_path:
-            paths.extend(ld_path.split(":"))
-
-        return paths
-
-    def _get_cuda_fallback_names(self) -> List[str]:
-        """Get CUDA library names to try loading directly."""
-        if sys.platform.startswith("win"):
-            # Windows DLL names - try common versions
-            return [
-                "cudart64_12.dll",
-                "cudart64_120.dll",
-                "cudart64_110.dll",
-                "cudart64_11.dll",
-                "cudart64_102.dll",
-                "cudart64_101.dll",
-            ]
-        elif sys.platform.startswith("linux"):
-            return [
-                "libcudart.so",
-                "libcudart.so.12",
-                "libcudart.so.11",
-            ]
-        return []
+
+        return _unique_paths(chain(
+            cuda_paths,
+            (
+                "/usr/local/cuda/lib64",
+                "/usr/local/cuda/lib",
+                "/usr/lib/x86_64-linux-gnu",
+                "/usr/lib64",
+                "/usr/lib",
+            ),
+            ld_path.split(":") if ld_path else (),
+        ))
+
+    # The OS never changes at runtime, so the CUDA library naming scheme and
+    # search-path builder are resolved once when the class is created.
+    if sys.platform.startswith("win"):
+        # cudart64_*.dll (e.g., cudart64_110.dll, cudart64_12.dll)
+        _cuda_lib_affixes: Optional[Tuple[str, str]] = ("cudart", ".dll")
+        _cuda_fallback_names: Tuple[str, ...] = (
+            "cudart64_12.dll",
+            "cudart64_120.dll",
+            "cudart64_110.dll",
+            "cudart64_11.dll",
+            "cudart64_102.dll",
+            "cudart64_101.dll",
+        )
+        _get_cuda_search_paths = _get_windows_cuda_paths
+    elif sys.platform.startswith("linux"):
+        # libcudart.so* (e.g., libcudart.so.11, libcudart.so.12)
+        _cuda_lib_affixes = ("libcudart.so", "")
+        _cuda_fallback_names = ()  # resolved through find_library("cudart") instead
+        _get_cuda_search_paths = _get_linux_cuda_paths
+    else:
+        _cuda_lib_affixes = None
+        _cuda_fallback_names = ()
+        _get_cuda_search_paths = None
 
     def _try_load_library(self, lib_path: str) -> bool:
         """Attempt to load a shared library."""
@@ -206,26 +399,145 @@ class PlatformBase(ABC):
 
     def _detect_nvidia(self) -> Optional[Dict[str, Any]]:
         """
-        Detect NVIDIA GPU using nvidia-smi.
+        Detect NVIDIA GPU through NVML, falling back to nvidia-smi when the
+        NVML library can't be loaded.
         Cross-platform method that works on Windows, Linux, and macOS.
+        The result is cached for the lifetime of the process.
+
+        Returns:
+            GPU info dict or None
+        """
+        if PlatformBase._nvidia_cached is _UNSET:
+            # Overlapping callers wait for the running probe instead of
+            # stacking more nvidia-smi children
+            with _NVIDIA_PROBE_LOCK:
+                if PlatformBase._nvidia_cached is _UNSET:
+                    PlatformBase._nvidia_cached = self._probe_nvidia()
+        return PlatformBase._nvidia_cached
+
+    def _probe_nvidia(self) -> Optional[Dict[str, Any]]:
+        """Driver pre-check, then NVML, then nvidia-smi (uncached)."""
+        if not self._nvidia_driver_present():
+            return None
+        result = self._query_nvml()
+        if result is _UNSET:
+            result = self._query_nvidia_smi()
+        return result
+
+    def _detect_first(self, *probes: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        Run GPU probes concurrently and return the preferred hit.
+
+        Probes are given in order of preference.  A hit is returned as soon as
+        every higher-priority probe has finished empty-handed, so the wall time
+        is that of the slowest probe that matters rather than the sum of all.
 
         Returns:
             GPU info dict or None
         """
+        executor = ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix="gpu-probe")
         try:
-            result = subprocess.run(
-                [
-                    "nvidia-smi",
-                    "--query-gpu=name,memory.total",
-                    "--format=csv,noheader,nounits"
-                ],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
+            futures = {executor.submit(probe): rank for rank, probe in enumerate(probes)}
+            results: Dict[int, Optional[Dict[str, Any]]] = {}
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    logger.debug("GPU probe failed: %s", e)
+                    results[futures[future]] = None
+                # Walk the ranks in order until we hit one still running
+                for rank in range(len(probes)):
+                    if rank not in results:
+                        break
+                    if results[rank]:
+                        return results[rank]
+            return None
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _log_missing(self, tool: str) -> None:
+        """Shared log line for a vendor CLI that isn't installed."""
+        logger.debug("%s not found on %s", tool, self.get_platform_name())
+
+    def _log_probe_failure(self, vendor: str, error: Exception) -> None:
+        """Shared log line for a vendor probe that failed unexpectedly."""
+        logger.debug("%s detection failed on %s: %s", vendor, self.get_platform_name(), error)
+
+    @staticmethod
+    def _nvidia_driver_present() -> bool:
+        """Cheap check for an NVIDIA driver before loading NVML or spawning nvidia-smi."""
+        if sys.platform.startswith("linux"):
+            return os.path.exists("/proc/driver/nvidia/version")
+        return shutil.which("nvidia-smi") is not None
+
+    @staticmethod
+    def _amd_driver_present() -> bool:
+        """Cheap check for the amdgpu/ROCm stack before querying ROCm SMI."""
+        if sys.platform.startswith("linux"):
+            return os.path.exists("/sys/module/amdgpu") or os.path.exists("/dev/kfd")
+        return shutil.which("rocm-smi") is not None
+
+    def _query_nvml(self) -> Optional[Dict[str, Any]]:
+        """
+        Query the first GPU in-process through the NVML C API (no subprocess).
+
+        Returns:
+            GPU info dict, None if NVML works but reports no usable GPU,
+            or _UNSET if NVML itself is unavailable.
+        """
+        nvml = None
+        for lib_name in _NVML_LIB_NAMES:
+            try:
+                nvml = ctypes.CDLL(lib_name)
+                break
+            except OSError:
+                continue
+        if nvml is None:
+            return _UNSET
+
+        try:
+            if nvml.nvmlInit_v2() != 0:
+                return _UNSET
+        except AttributeError:
+            return _UNSET
 
-            if result.returncode == 0 and result.stdout.strip():
-                line = result.stdout.strip().split("\n")[0]
+        try:
+            handle = ctypes.c_void_p()
+            if nvml.nvmlDeviceGetHandleByIndex_v2(0, ctypes.byref(handle)) != 0:
+                return None
+
+            name = ctypes.create_string_buffer(96)
+            memory = _NvmlMemory()
+            if nvml.nvmlDeviceGetName(handle, name, len(name)) != 0:
+                return None
+            if nvml.nvmlDeviceGetMemoryInfo(handle, ctypes.byref(memory)) != 0:
+                return None
+
+            return {
+                "gpu_name": name.value.decode("utf-8", errors="replace"),
+                "vram_gb": round(memory.total / (1024 ** 3), 1),
+                "detection_method": "nvml",
+            }
+        except Exception as e:
+            logger.debug("NVML query failed: %s", e)
+            return _UNSET
+        finally:
+            nvml.nvmlShutdown()
+
+    def _query_nvidia_smi(self) -> Optional[Dict[str, Any]]:
+        """Run nvidia-smi and parse the first GPU's name and VRAM (uncached)."""
+        try:
+            # -i 0: only initialise the device we actually report
+            returncode, stdout = _run_probe([
+                "nvidia-smi",
+                "-i", "0",
+                "--query-gpu=name,memory.total",
+                "--format=csv,noheader,nounits"
+            ])
+
+            stdout = stdout.decode("ascii", "replace").strip()
+            if returncode == 0 and stdout:
+                line = stdout.split("\n")[0]
                 parts = line.split(", ")
                 if len(parts) >= 2:
                     gpu_name = parts[0].strip()
@@ -238,59 +550,124 @@ class PlatformBase(ABC):
                         "detection_method": "nvidia_smi",
                     }
         except FileNotFoundError:
-            logger.debug("nvidia-smi not found")
+            self._log_missing("nvidia-smi")
         except Exception as e:
-            logger.debug("NVIDIA detection failed: %s", e)
+            self._log_probe_failure("NVIDIA", e)
 
         return None
 
     def _detect_amd(self) -> Optional[Dict[str, Any]]:
         """
-        Detect AMD GPU using rocm-smi.
+        Detect AMD GPU through the ROCm SMI library (pyrsmi), falling back
+        to the rocm-smi CLI when the bindings aren't installed.
         Cross-platform method for AMD ROCm detection.
+        The result is cached for the lifetime of the process.
 
         Returns:
             GPU info dict or None
         """
+        if PlatformBase._amd_cached is _UNSET:
+            with _AMD_PROBE_LOCK:
+                if PlatformBase._amd_cached is _UNSET:
+                    PlatformBase._amd_cached = self._probe_amd()
+        return PlatformBase._amd_cached
+
+    def _probe_amd(self) -> Optional[Dict[str, Any]]:
+        """Driver pre-check, then ROCm SMI library, then rocm-smi (uncached)."""
+        if not self._amd_driver_present():
+            return None
+        result = self._query_rocm_library()
+        if result is _UNSET:
+            result = self._query_rocm_smi()
+        return result
+
+    def _query_rocm_library(self) -> Optional[Dict[str, Any]]:
+        """
+        Query the first AMD GPU in-process through the optional pyrsmi
+        bindings to the ROCm SMI library (no subprocess).
+
+        Returns:
+            GPU info dict, None if ROCm SMI works but reports no GPU,
+            or _UNSET if pyrsmi isn't installed or can't initialise.
+        """
+        try:
+            from pyrsmi import rocml
+        except ImportError:
+            return _UNSET
+
+        try:
+            rocml.smi_initialize()
+        except Exception as e:
+            logger.debug("ROCm SMI initialisation failed: %s", e)
+            return _UNSET
+
+        try:
+            if rocml.smi_get_device_count() < 1:
+                return None
+            total_bytes = rocml.smi_get_device_memory_total(0)
+            return {
+                "gpu_name": rocml.smi_get_device_name(0),
+                "vram_gb": round(total_bytes / (1024 ** 3), 1) if total_bytes else None,
+                "detection_method": "rocm_smi_lib",
+            }
+        except Exception as e:
+            logger.debug("ROCm SMI query failed: %s", e)
+            return _UNSET
+        finally:
+            rocml.smi_shutdown()
+
+    def _query_rocm_smi(self) -> Optional[Dict[str, Any]]:
+        """
+        Run rocm-smi once (product name + VRAM, JSON output) and parse the
+        first card (uncached).
+        """
         try:
-            result = subprocess.run(
-                ["rocm-smi", "--showproductname"],
-                capture_output=True,
-                text=True,
-                timeout=5,
+            returncode, stdout = _run_probe(
+                ["rocm-smi", "--showproductname", "--showmeminfo", "vram", "--json"]
             )
 
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.split("\n"):
-                    if "GPU" in line or "Card" in line:
-                        gpu_name = line.strip()
-
-                        # Try to get VRAM
-                        vram_result = subprocess.run(
-                            ["rocm-smi", "--showmeminfo", "vram"],
-                            capture_output=True,
-                            text=True,
-                            timeout=5,
-                        )
-
-                        vram_gb = None
-                        if vram_result.returncode == 0:
-                            for vline in vram_result.stdout.split("\n"):
-                                if "Total" in vline:
-                                    parts = vline.split()
-                                    for p in parts:
-                                        if p.isdigit():
-                                            vram_gb = float(p) / 1024
-                                            break
-
-                        return {
-                            "gpu_name": gpu_name,
-                            "vram_gb": round(vram_gb, 1) if vram_gb else None,
-                            "detection_method": "rocm_smi",
-                        }
+            if returncode == 0 and stdout.strip():
+                try:
+                    return self._parse_rocm_json(json.loads(stdout))
+                except ValueError:
+                    # Some rocm-smi builds print warnings around the JSON
+                    # (or plain text); fall back to a single regex pass
+                    return self._parse_rocm_text(stdout.decode("utf-8", "replace"))
         except FileNotFoundError:
-            logger.debug("rocm-smi not found")
+            self._log_missing("rocm-smi")
         except Exception as e:
-            logger.debug("AMD detection failed: %s", e)
+            self._log_probe_failure("AMD", e)
 
         return None
+
+    @staticmethod
+    def _parse_rocm_json(cards: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Pick the first card out of `rocm-smi --json` output."""
+        # {"card0": {"Card series": "...", "VRAM Total Memory (B)": "17163091968", ...}}
+        for card_id, fields in cards.items():
+            if not card_id.startswith("card"):
+                continue
+            # Key capitalisation differs between rocm-smi releases
+            fields = {key.lower(): value for key, value in fields.items()}
+            total_bytes = str(fields.get("vram total memory (b)", ""))
+            vram_gb = int(total_bytes) / (1024 ** 3) if total_bytes.isdigit() else None
+
+            return {
+                "gpu_name": fields.get("card series") or fields.get("card sku") or card_id,
+                "vram_gb": round(vram_gb, 1) if vram_gb else None,
+                "detection_method": "rocm_smi",
+            }
+        return None
+
+    @staticmethod
+    def _parse_rocm_text(output: str) -> Optional[Dict[str, Any]]:
+        """Extract name and VRAM from rocm-smi output that isn't clean JSON."""
+        name = _ROCM_NAME_RE.search(output)
+        if name is None:
+            return None
+        vram = _ROCM_VRAM_RE.search(output)
+        return {
+            "gpu_name": name.group(1).strip(),
+            "vram_gb": round(int(vram.group(1)) / (1024 ** 3), 1) if vram else None,
+            "detection_method": "rocm_smi",
+        }
@@ -3,15 +3,35 @@ Linux-specific platform implementation.
 Handles Linux-specific paths, GPU detection (NVIDIA/AMD), and CUDA backend support.
 """
 
+import functools
 import os
 import logging
 from pathlib import Path
 from typing import Optional, Dict, Any
-from .base import PlatformBase
+from .base import PlatformBase, _backend_env, _cached_backend_support, cached_probe
 
 logger = logging.getLogger("dental_assistant.platform.linux")
 
 
+# Data root, resolved on first use (not at import: Path.home() raises without
+# HOME) and cached until refresh(), so a lookup is a single join
+@functools.lru_cache(maxsize=1)
+def _base_dir() -> Path:
+    xdg_data_home = os.getenv("XDG_DATA_HOME")
+    return Path(xdg_data_home) if xdg_data_home else Path.home() / ".local" / "share"
+
+
+@functools.lru_cache(maxsize=8)
+def _user_data_dir(app_name: str) -> Path:
+    return _base_dir() / app_name
+
+
+def refresh() -> None:
+    """Re-read XDG_DATA_HOME and drop cached user data directories."""
+    _base_dir.cache_clear()
+    _user_data_dir.cache_clear()
+
+
 class LinuxPlatform(PlatformBase):
     """Linux-specific platform operations."""
 
@@ -26,30 +46,22 @@ class LinuxPlatform(PlatformBase):
         Returns:
             Path to $XDG_DATA_HOME/AppName or ~/.local/share/AppName
         """
-        xdg = os.getenv("XDG_DATA_HOME")
-        root = Path(xdg) if xdg else (Path.home() / ".local" / "share")
-        return root / app_name
+        return _user_data_dir(app_name)
 
+    @cached_probe("_gpu_cache")
     def detect_gpu(self) -> Optional[Dict[str, Any]]:
         """
         Detect GPU on Linux.
-        Tries NVIDIA (nvidia-smi) and AMD (rocm-smi) detection.
+        Tries NVIDIA (NVML/nvidia-smi) and AMD (ROCm SMI) detection concurrently.
         Uses shared detection methods from base class.
 
+        The result is cached for the lifetime of the process.
+
         Returns:
             GPU info dict or None
         """
-        # Try NVIDIA first (most common for ML/AI workloads)
-        nvidia_info = self._detect_nvidia()
-        if nvidia_info:
-            return nvidia_info
-
-        # Try AMD ROCm (common on Linux for AMD GPUs)
-        amd_info = self._detect_amd()
-        if amd_info:
-            return amd_info
-
-        return None
+        # Both probes run in parallel; NVIDIA wins if both report a GPU
+        return self._detect_first(self._detect_nvidia, self._detect_amd)
 
     def check_gpu_backend_support(self) -> bool:
         """
@@ -59,6 +71,10 @@ class LinuxPlatform(PlatformBase):
         Returns:
             True if CUDA backend is supported
         """
+        return _cached_backend_support(self._probe_gpu_backend, _backend_env())
+
+    def _probe_gpu_backend(self) -> bool:
+        """Uncached body of check_gpu_backend_support."""
         # Use shared cross-platform CUDA detection from base class
         return self.check_cuda_available()
 
@@ -3,16 +3,85 @@ macOS-specific platform implementation.
 Handles macOS-specific paths, Apple Silicon GPU detection, and Metal backend support.
 """
 
+import ctypes
+import functools
 import os
 import logging
+import platform
 import subprocess
 from pathlib import Path
 from typing import Optional, Dict, Any
-from .base import PlatformBase
+from .base import PlatformBase, _backend_env, _cached_backend_support, cached_probe
 
 logger = logging.getLogger("dental_assistant.platform.macos")
 
 
+# Data root, resolved on first use (not at import: Path.home() raises without
+# HOME) and cached until refresh(), so a lookup is a single join
+@functools.lru_cache(maxsize=1)
+def _base_dir() -> Path:
+    return Path.home() / "Library" / "Application Support"
+
+
+@functools.lru_cache(maxsize=8)
+def _user_data_dir(app_name: str) -> Path:
+    return _base_dir() / app_name
+
+
+def refresh() -> None:
+    """Re-resolve the data root and drop cached user data directories (e.g. after HOME changed)."""
+    _base_dir.cache_clear()
+    _user_data_dir.cache_clear()
+
+
+# ---------------------------------------------------------------------------
+# sysctl helpers: sysctlbyname(3) through ctypes, `sysctl -n` as a fallback
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=1)
+def _libsystem() -> Optional[ctypes.CDLL]:
+    try:
+        return ctypes.CDLL("/usr/lib/libSystem.B.dylib")
+    except OSError:
+        return None
+
+
+def _sysctl_cli(name: str) -> Optional[str]:
+    """Read a sysctl value by spawning `sysctl -n` (fallback path)."""
+    try:
+        result = subprocess.run(["sysctl", "-n", name], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def _sysctl_str(name: str) -> Optional[str]:
+    """Read a string sysctl (e.g. machdep.cpu.brand_string)."""
+    libc = _libsystem()
+    if libc is None:
+        return _sysctl_cli(name)
+    key = name.encode()
+    size = ctypes.c_size_t(0)
+    if libc.sysctlbyname(key, None, ctypes.byref(size), None, 0) != 0:
+        return _sysctl_cli(name)
+    buf = ctypes.create_string_buffer(size.value)
+    if libc.sysctlbyname(key, buf, ctypes.byref(size), None, 0) != 0:
+        return _sysctl_cli(name)
+    return buf.value.decode("utf-8", errors="replace").strip()
+
+
+def _sysctl_u64(name: str) -> Optional[int]:
+    """Read a 64-bit integer sysctl (e.g. hw.memsize)."""
+    libc = _libsystem()
+    if libc is not None:
+        value = ctypes.c_uint64(0)
+        size = ctypes.c_size_t(ctypes.sizeof(value))
+        if libc.sysctlbyname(name.encode(), ctypes.byref(value), ctypes.byref(size), None, 0) == 0:
+            return value.value
+    text = _sysctl_cli(name)
+    return int(text) if text and text.isdigit() else None
+
+
 class MacOSPlatform(PlatformBase):
     """macOS-specific platform operations."""
 
@@ -27,14 +96,17 @@ class MacOSPlatform(PlatformBase):
         Returns:
             Path to ~/Library/Application Support/AppName
         """
-        return Path.home() / "Library" / "Application Support" / app_name
+        return _user_data_dir(app_name)
 
+    @cached_probe("_gpu_cache")
     def detect_gpu(self) -> Optional[Dict[str, Any]]:
         """
         Detect GPU on macOS.
         Primarily detects Apple Silicon (M1/M2/M3/M4).
         Also checks for NVIDIA (legacy Mac Pro with eGPU) using shared base method.
 
+        The result is cached for the lifetime of the process.
+
         Returns:
             GPU info dict or None
         """
@@ -43,7 +115,11 @@ class MacOSPlatform(PlatformBase):
         if apple_info:
             return apple_info
 
-        # Try NVIDIA (rare, only on older Mac Pros or eGPUs)
+        # Try NVIDIA (rare, only on older Mac Pros or eGPUs).  Those are all
+        # Intel Macs; anywhere else nvidia-smi can't exist, so skip the spawn.
+        if platform.machine() != "x86_64":
+            return None
+
         nvidia_info = self._detect_nvidia()
         if nvidia_info:
             return nvidia_info
@@ -53,47 +129,49 @@ class MacOSPlatform(PlatformBase):
     def _detect_apple_silicon(self) -> Optional[Dict[str, Any]]:
         """
         Detect Apple Silicon (M1/M2/M3/M4) on macOS.
-        Uses sysctl to check CPU brand and memory.
+        Reads the CPU brand and memory size with sysctlbyname(3).
 
         Returns:
             GPU info dict or None
         """
-        try:
-            # Check for Apple Silicon via sysctl
-            result = subprocess.run(
-                ["sysctl", "-n", "machdep.cpu.brand_string"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
+        # uname() is enough to rule out Apple Silicon on Intel Macs without
+        # spawning sysctl.  A Rosetta-translated interpreter also reports
+        # x86_64 and is treated like an Intel Mac.
+        if platform.machine() != "arm64":
+            return None
 
-            if result.returncode == 0:
-                cpu_brand = result.stdout.strip()
-                if "Apple" in cpu_brand:
-                    # Get unified memory size
-                    mem_result = subprocess.run(
-                        ["sysctl", "-n", "hw.memsize"],
-                        capture_output=True,
-                        text=True,
-                        timeout=5,
-                    )
-
-                    vram_gb = None
-                    if mem_result.returncode == 0:
-                        total_bytes = int(mem_result.stdout.strip())
-                        # Apple Silicon shares RAM with GPU, estimate ~75% available
-                        vram_gb = round((total_bytes / (1024**3)) * 0.75, 1)
-
-                    return {
-                        "gpu_name": cpu_brand,
-                        "vram_gb": vram_gb,
-                        "detection_method": "apple_silicon",
-                    }
+        try:
+            cpu_brand = _sysctl_str("machdep.cpu.brand_string")
+            if cpu_brand and "Apple" in cpu_brand:
+                # Unified memory size
+                total_bytes = _sysctl_u64("hw.memsize")
+
+                vram_gb = None
+                if total_bytes:
+                    # Apple Silicon shares RAM with GPU, estimate ~75% available
+                    vram_gb = round((total_bytes / (1024**3)) * 0.75, 1)
+
+                return {
+                    "gpu_name": cpu_brand,
+                    "vram_gb": vram_gb,
+                    "detection_method": "apple_silicon",
+                }
         except Exception as e:
             logger.debug("Apple Silicon detection failed on macOS: %s", e)
 
         return None
 
+    def _probe_cpu_int8_dot(self) -> bool:
+        """Arm dotprod on Apple Silicon, AVX512-VNNI on Intel Macs (via sysctl)."""
+        if platform.machine() == "arm64":
+            # Key name changed in macOS 12; every Apple Silicon core has dotprod
+            return any(
+                _sysctl_u64(key) == 1
+                for key in ("hw.optional.arm.FEAT_DotProd", "hw.optional.armv8_2_dotprod")
+            )
+        features = _sysctl_str("machdep.cpu.leaf7_features") or ""
+        return "AVX512VNNI" in features.split()
+
     def check_gpu_backend_support(self) -> bool:
         """
         Check if llama-cpp-python has GPU support on macOS.
@@ -103,6 +181,10 @@ class MacOSPlatform(PlatformBase):
         Returns:
             True if Metal backend is supported
         """
+        return _cached_backend_support(self._probe_gpu_backend, _backend_env())
+
+    def _probe_gpu_backend(self) -> bool:
+        """Uncached body of check_gpu_backend_support."""
         # Check environment hints for Metal
         if os.getenv("LLAMA_METAL") == "1":
             return True
@@ -3,15 +3,35 @@ Windows-specific platform implementation.
 Handles Windows-specific paths, GPU detection, and backend support.
 """
 
+import functools
 import os
 import logging
 from pathlib import Path
 from typing import Optional, Dict, Any
-from .base import PlatformBase
+from .base import PlatformBase, _backend_env, _cached_backend_support, cached_probe
 
 logger = logging.getLogger("dental_assistant.platform.windows")
 
 
+# Data root, resolved on first use (not at import: Path.home() raises without
+# HOME) and cached until refresh(), so a lookup is a single join
+@functools.lru_cache(maxsize=1)
+def _base_dir() -> Path:
+    appdata = os.getenv("APPDATA")
+    return Path(appdata) if appdata else Path.home() / "AppData" / "Roaming"
+
+
+@functools.lru_cache(maxsize=8)
+def _user_data_dir(app_name: str) -> Path:
+    return _base_dir() / app_name
+
+
+def refresh() -> None:
+    """Re-read APPDATA and drop cached user data directories."""
+    _base_dir.cache_clear()
+    _user_data_dir.cache_clear()
+
+
 class WindowsPlatform(PlatformBase):
     """Windows-specific platform operations."""
 
@@ -26,29 +46,22 @@ class WindowsPlatform(PlatformBase):
         Returns:
             Path to Windows AppData\\Roaming\\AppName
         """
-        root = os.getenv("APPDATA") or str(Path.home() / "AppData" / "Roaming")
-        return Path(root) / app_name
+        return _user_data_dir(app_name)
 
+    @cached_probe("_gpu_cache")
     def detect_gpu(self) -> Optional[Dict[str, Any]]:
         """
         Detect GPU on Windows.
-        Tries NVIDIA (nvidia-smi) and AMD (rocm-smi) detection.
+        Tries NVIDIA (NVML/nvidia-smi) and AMD (ROCm SMI) detection concurrently.
         Uses shared detection methods from base class.
 
+        The result is cached for the lifetime of the process.
+
         Returns:
             GPU info dict or None
         """
-        # Try NVIDIA first (most common on Windows)
-        nvidia_info = self._detect_nvidia()
-        if nvidia_info:
-            return nvidia_info
-
-        # Try AMD ROCm (less common on Windows but possible)
-        amd_info = self._detect_amd()
-        if amd_info:
-            return amd_info
-
-        return None
+        # Both probes run in parallel; NVIDIA wins if both report a GPU
+        return self._detect_first(self._detect_nvidia, self._detect_amd)
 
     def check_gpu_backend_support(self) -> bool:
         """
@@ -58,6 +71,10 @@ class WindowsPlatform(PlatformBase):
         Returns:
             True if GPU backend is supported
         """
+        return _cached_backend_support(self._probe_gpu_backend, _backend_env())
+
+    def _probe_gpu_backend(self) -> bool:
+        """Uncached body of check_gpu_backend_support."""
         # Use shared cross-platform CUDA detection from base class
         return self.check_cuda_available()
 
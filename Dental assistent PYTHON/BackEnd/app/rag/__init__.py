@@ -7,7 +7,7 @@ Provides:
 - RAG-enhanced SmartNote generation with dental knowledge retrieval
 """
 
-from app.rag.store import DentalDocumentStore
-from app.rag.pipelines import DentalRAGPipeline
+from app.rag.store import DentalDocumentStore, get_document_store
+from app.rag.pipelines import DentalRAGPipeline, get_rag_pipeline
 
-__all__ = ["DentalDocumentStore", "DentalRAGPipeline"]
+__all__ = ["DentalDocumentStore", "DentalRAGPipeline", "get_document_store", "get_rag_pipeline"]
@@ -0,0 +1,52 @@
+"""
+In-memory exact nearest-neighbour index for the knowledge base.
+
+The knowledge corpus is small and static, so a brute-force squared-L2 scan
+over one float32 matrix (a single matrix-vector product) beats a round trip
+through Chroma's SQLite + HNSW layers.  Squared L2 is Chroma's default
+distance, so rankings and scores match what ChromaEmbeddingRetriever returns
+(exactly, rather than HNSW's approximation).  Chroma stays the durable store.
+"""
+
+import logging
+
+from haystack import Document
+
+logger = logging.getLogger("dental_assistant.rag.flat_index")
+
+
+class FlatL2Index:
+    """Exact squared-L2 search over a fixed set of embedded documents."""
+
+    def __init__(self, documents: list[Document]) -> None:
+        import numpy as np
+
+        self._documents = documents
+        self._matrix = np.asarray([doc.embedding for doc in documents], dtype=np.float32)
+        # ||x||^2 per row, so a query costs one matvec: ||x||^2 - 2 x.q + ||q||^2
+        self._sq_norms = np.einsum("ij,ij->i", self._matrix, self._matrix)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def search(self, query_embedding: list[float], top_k: int) -> list[Document]:
+        """Return up to top_k documents, closest first, with score = squared L2 distance."""
+        import numpy as np
+
+        if not self._documents or top_k <= 0:
+            return []
+        q = np.asarray(query_embedding, dtype=np.float32)
+        distances = self._sq_norms - 2.0 * (self._matrix @ q) + float(q @ q)
+
+        k = min(top_k, len(self._documents))
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest])]
+        return [
+            Document(
+                id=self._documents[i].id,
+                content=self._documents[i].content,
+                meta=self._documents[i].meta,
+                score=float(distances[i]),
+            )
+            for i in nearest
+        ]
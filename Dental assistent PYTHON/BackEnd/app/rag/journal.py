@@ -8,86 +8,419 @@ can be used to rebuild the vector index from scratch.
 File location: ``user_data_dir() / "consultations.jsonl"``
 (deliberately outside the ``rag_data/`` directory so that wiping
 ChromaDB does not destroy the journal).
+
+Once the active file reaches JOURNAL_SEGMENT_RECORDS records it is closed
+as ``consultations-000001.jsonl`` (then ``-000002`` ...) and gzipped in the
+background to ``consultations-000001.jsonl.gz``.  Appends always go to the
+plain active file; read_all() / count() cover the segments, oldest first.
 """
 
-import json
+import atexit
+import functools
+import gzip
 import logging
+import mmap
 import os
+import queue
+import re
+import shutil
 import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
+
+import orjson
 
 logger = logging.getLogger("dental_assistant.rag.journal")
 
-# All writes go through this lock to guarantee one writer at a time.
-_write_lock = threading.Lock()
+# append() only encodes the record and enqueues it; a single writer thread
+# owns the files.  It drains whatever is queued with one os.write() per
+# journal and fsyncs at most every _FSYNC_INTERVAL_S (group commit), so
+# concurrent saves share one fsync.  append() returns a JournalReceipt whose
+# wait() blocks until that record is fsynced and raises if it was lost;
+# flush() does the same for everything queued so far and also reports
+# failures of records nobody waited on.
+_QUEUE_SIZE = int(os.getenv("JOURNAL_QUEUE_SIZE", "1024"))
+_FSYNC_INTERVAL_S = int(os.getenv("JOURNAL_FSYNC_INTERVAL_MS", "50")) / 1000
+_MAX_BATCH = 256
+# Records per journal file before it is rotated into a gzipped segment
+_SEGMENT_RECORDS = int(os.getenv("JOURNAL_SEGMENT_RECORDS", "10000"))
+
+# read_all() / count() (and interpreter exit) wait at most this long for queued records
+_READ_FLUSH_TIMEOUT_S = 5.0
+
+
+class JournalWriteError(OSError):
+    """Records queued for the journal could not be written or fsynced."""
+
+
+class JournalReceipt:
+    """Returned by append() (and used by flush()); settled by the writer thread."""
+
+    __slots__ = ("_done", "_error")
+
+    def __init__(self) -> None:
+        self._done = threading.Event()
+        self._error: JournalWriteError | None = None
+
+    def _settle(self, error: JournalWriteError | None) -> None:
+        self._error = error
+        self._done.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Block until the record is written and fsynced.
 
+        Returns False if the timeout expired first.
 
+        Raises:
+            JournalWriteError: the record could not be written or fsynced
+        """
+        if not self._done.wait(timeout):
+            return False
+        if self._error is not None:
+            raise self._error
+        return True
+
+
+_queue: "queue.Queue[tuple[str, bytes, JournalReceipt] | JournalReceipt]" = queue.Queue(maxsize=_QUEUE_SIZE)
+
+# Records rejected because the writer queue was full
+journal_dropped = 0
+
+# First write/fsync failure not yet reported through flush()
+_error: JournalWriteError | None = None
+
+
+def _record_error(message: str, exc: BaseException) -> JournalWriteError:
+    global _error
+    logger.error("CRITICAL: %s", message, exc_info=exc)
+    error = JournalWriteError(f"{message}: {exc}")
+    if _error is None:  # only the writer thread sets or clears it
+        _error = error
+    return error
+
+
+def _settle(receipts: list[JournalReceipt], error: JournalWriteError | None) -> None:
+    for receipt in receipts:
+        receipt._settle(error)
+
+
+@functools.lru_cache(maxsize=1)
 def _default_path() -> Path:
-    """Journal lives next to, but outside, the ChromaDB rag_data dir."""
+    """
+    Journal lives next to, but outside, the ChromaDB rag_data dir.
+
+    Resolved once per process; call ``_default_path.cache_clear()`` after
+    changing DENTAL_ASSISTANT_DATA_DIR or the platform data dir.
+    """
     from app.config import user_data_dir
 
     return user_data_dir() / "consultations.jsonl"
 
 
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _open(path: str) -> int:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+
+def _segment_pattern(path: Path) -> "re.Pattern[str]":
+    return re.compile(rf"{re.escape(path.stem)}-(\d+){re.escape(path.suffix)}(\.gz)?")
+
+
+def _segments(path: Path) -> list[Path]:
+    """
+    Closed segments of a journal, oldest first.
+
+    A segment whose gzip is complete is read from the .gz; one still being
+    compressed (or interrupted by a crash) from its plain file.
+    """
+    pattern = _segment_pattern(path)
+    found: dict[int, Path] = {}
+    try:
+        with os.scandir(path.parent) as entries:
+            for entry in entries:
+                m = pattern.fullmatch(entry.name)
+                if m and (m.group(2) or int(m.group(1)) not in found):
+                    found[int(m.group(1))] = Path(entry.path)
+    except FileNotFoundError:
+        return []
+    return [found[n] for n in sorted(found)]
+
+
+def _compress_segment(segment: Path) -> None:
+    """gzip a closed segment next to itself, then drop the plain copy."""
+    target = _compressed(segment)
+    tmp = target.with_name(target.name + ".tmp")
+    try:
+        with open(segment, "rb") as src, gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp, target)
+        segment.unlink()
+    except OSError:
+        logger.exception("Journal segment compression failed for %s (plain copy kept)", segment.name)
+
+
+def _rotate(path: str) -> None:
+    """Close out the active journal file as the next numbered segment."""
+    active = Path(path)
+    numbers = [int(_segment_pattern(active).fullmatch(p.name).group(1)) for p in _segments(active)]
+    segment = active.with_name(f"{active.stem}-{max(numbers, default=0) + 1:06d}{active.suffix}")
+    os.replace(active, segment)
+    threading.Thread(
+        target=_compress_segment, args=(segment,), name="journal-compress", daemon=True
+    ).start()
+
+
+def _writer_loop() -> None:
+    global _error
+    fds: dict[str, int] = {}      # long-lived append fds, one per journal
+    records: dict[str, int] = {}  # records in each open active file
+    dirty: set[str] = set()       # written since the last fsync
+    unsynced: dict[str, list[JournalReceipt]] = {}  # receipts waiting on that fsync
+    last_sync = time.monotonic()
+
+    while True:
+        try:
+            # Only wake on a timer while there is something left to fsync
+            first = _queue.get(timeout=_FSYNC_INTERVAL_S if dirty else None)
+            batch = [first]
+        except queue.Empty:
+            batch = []
+        while len(batch) < _MAX_BATCH:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        waiters: list[JournalReceipt] = []
+        chunks: dict[str, list[tuple[bytes, JournalReceipt]]] = {}
+        for item in batch:
+            if isinstance(item, JournalReceipt):
+                waiters.append(item)
+            else:
+                chunks.setdefault(item[0], []).append(item[1:])
+
+        # Anything escaping here would kill the thread and leave every
+        # later wait() blocked forever, hence Exception, not just OSError.
+        for path, items in chunks.items():
+            unsynced.setdefault(path, []).extend(receipt for _, receipt in items)
+            try:
+                fd = fds.get(path)
+                if fd is None:
+                    fd = fds[path] = _open(path)
+                    records[path] = _count_file(Path(path))
+                _write_all(fd, b"".join(line for line, _ in items))
+                dirty.add(path)
+                records[path] += len(items)
+                if records[path] >= _SEGMENT_RECORDS:
+                    # Durable before it is renamed and handed to the compressor
+                    os.fsync(fd)
+                    dirty.discard(path)
+                    _settle(unsynced.pop(path), None)
+                    os.close(fds.pop(path))
+                    del records[path]
+                    _rotate(path)
+            except Exception as e:
+                # Unsynced records on the dropped fd are not known to be durable
+                error = _record_error(f"journal write failed for {len(items)} record(s)", e)
+                _settle(unsynced.pop(path, []), error)
+                records.pop(path, None)
+                dirty.discard(path)
+                _close_quietly(fds.pop(path, None))
+
+        if dirty and (waiters or time.monotonic() - last_sync >= _FSYNC_INTERVAL_S):
+            for path in dirty:
+                try:
+                    os.fsync(fds[path])
+                    _settle(unsynced.pop(path, []), None)
+                except Exception as e:
+                    _settle(unsynced.pop(path, []), _record_error("journal fsync failed", e))
+                    records.pop(path, None)
+                    _close_quietly(fds.pop(path, None))
+            dirty.clear()
+            last_sync = time.monotonic()
+
+        # Everything queued before these requests is now written and fsynced,
+        # or _error says why not
+        if waiters:
+            _settle(waiters, _error)
+            _error = None
+
+
+def _close_quietly(fd: int | None) -> None:
+    if fd is not None:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+_writer = threading.Thread(target=_writer_loop, name="journal-writer", daemon=True)
+_writer.start()
+
+
 def append(
     record: dict,
     *,
     path: Path | None = None,
-) -> None:
+) -> JournalReceipt:
     """
-    Append a single consultation record to the journal.
+    Queue a single consultation record for the journal.
+
+    The background writer writes and fsyncs it within about
+    JOURNAL_FSYNC_INTERVAL_MS; call wait() on the returned receipt to block
+    until then and learn whether it succeeded.
 
-    Writes are flushed and fsynced so the record survives a crash
-    immediately after this call returns.
+    Raises:
+        queue.Full: the writer is too far behind (counted in journal_dropped)
     """
+    global journal_dropped
     path = path or _default_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
 
-    line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+    # UTF-8 bytes with the trailing newline, ready for os.write().  Datetimes
+    # are encoded natively (ISO 8601); anything else unknown falls back to str().
+    line = orjson.dumps(
+        record, default=str, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+    )
+
+    receipt = JournalReceipt()
+    try:
+        _queue.put_nowait((str(path), line, receipt))
+    except queue.Full:
+        journal_dropped += 1
+        logger.error("Journal queue full — record dropped (%d so far)", journal_dropped)
+        raise
+    return receipt
+
+
+def flush(timeout: float | None = None) -> bool:
+    """
+    Block until every record queued so far is written and fsynced.
+
+    Returns False if the timeout expired first.
+
+    Raises:
+        JournalWriteError: a record queued since the last flush() could not
+            be written or fsynced
+    """
+    request = JournalReceipt()
+    try:
+        _queue.put(request, timeout=timeout)
+    except queue.Full:
+        return False
+    return request.wait(timeout)
 
-    with _write_lock:
-        fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
-        try:
-            os.write(fd, line.encode("utf-8"))
-            os.fsync(fd)
-        finally:
-            os.close(fd)
+
+def _flush_quietly() -> None:
+    """flush() for readers and exit: bounded wait, failures logged, not raised."""
+    try:
+        if not flush(_READ_FLUSH_TIMEOUT_S):
+            logger.warning("Journal writer is behind; the latest records may not be on disk yet")
+    except JournalWriteError as e:
+        logger.warning("Journal has a failed write: %s", e)
+
+
+atexit.register(_flush_quietly)
+
+
+def _map(path: Path) -> mmap.mmap | None:
+    """Map a journal file read-only, or None if it is missing or empty."""
+    try:
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):  # ValueError: empty file
+        return None
+
+
+def _compressed(path: Path) -> Path:
+    return path.with_name(path.name + ".gz")
+
+
+def _iter_lines(path: Path) -> Iterator[bytes]:
+    """Yield the raw lines of one journal file (plain or gzipped segment)."""
+    if path.suffix == ".gz":
+        with gzip.open(path, "rb") as f:
+            yield from f
+        return
+    mm = _map(path)
+    if mm is None:
+        # A segment that finished compressing since it was listed
+        if _compressed(path).exists():
+            yield from _iter_lines(_compressed(path))
+        return
+    with mm:
+        pos, end = 0, len(mm)
+        while pos < end:
+            nl = mm.find(b"\n", pos)
+            if nl == -1:
+                nl = end
+            yield mm[pos:nl]
+            pos = nl + 1
+
+
+def _files(path: Path) -> list[Path]:
+    """Every file of a journal in record order: closed segments, then the active one."""
+    return _segments(path) + [path]
 
 
 def read_all(*, path: Path | None = None) -> List[dict]:
     """
-    Read every record from the journal.
+    Read every record from the journal, segments included.
 
     Skips malformed lines (e.g. partial writes from a hard crash)
     rather than failing entirely.
     """
-    path = path or _default_path()
-    if not path.exists():
-        return []
-
+    _flush_quietly()
     records: list[dict] = []
-    with open(path, "r", encoding="utf-8") as f:
-        for lineno, raw in enumerate(f, 1):
+    for file in _files(path or _default_path()):
+        for lineno, raw in enumerate(_iter_lines(file), 1):
             raw = raw.strip()
             if not raw:
                 continue
             try:
-                records.append(json.loads(raw))
-            except json.JSONDecodeError:
-                logger.warning("Skipping malformed journal line %d", lineno)
+                records.append(orjson.loads(raw))
+            except orjson.JSONDecodeError:
+                logger.warning("Skipping malformed journal line %d in %s", lineno, file.name)
     return records
 
 
-def count(*, path: Path | None = None) -> int:
-    """Return the number of records without loading them all into memory."""
-    path = path or _default_path()
-    if not path.exists():
-        return 0
-    n = 0
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
+def _count_file(path: Path) -> int:
+    """Count the lines of one journal file without parsing them."""
+    if path.suffix == ".gz":
+        n, last = 0, b"\n"
+        with gzip.open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                n += chunk.count(b"\n")
+                last = chunk[-1:]
+        return n + (last != b"\n")
+    mm = _map(path)
+    if mm is None:
+        return _count_file(_compressed(path)) if _compressed(path).exists() else 0
+    with mm:
+        if hasattr(mm, "count"):  # Python 3.13+
+            n = mm.count(b"\n")
+        else:
+            n, pos = 0, mm.find(b"\n")
+            while pos != -1:
                 n += 1
-    return n
+                pos = mm.find(b"\n", pos + 1)
+        return n + (mm[-1:] != b"\n")
+
+
+def count(*, path: Path | None = None) -> int:
+    """
+    Return the number of records without parsing them.
+
+    Counts lines with newline scans; a trailing line without its newline
+    (a torn final write) still counts.
+    """
+    _flush_quietly()
+    return sum(_count_file(file) for file in _files(path or _default_path()))
@@ -7,8 +7,15 @@ Pipelines:
 - RAG context: retrieve relevant knowledge for SmartNote generation
 """
 
+import functools
+import hashlib
 import logging
+import os
+import queue
 import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
@@ -16,10 +23,112 @@ from haystack import Document, Pipeline
 from haystack.components.writers import DocumentWriter
 from haystack.document_stores.types import DuplicatePolicy
 
-from app.rag.store import DentalDocumentStore, EMBEDDING_MODEL
+from app.rag.store import DentalDocumentStore, EMBEDDING_MODEL, merge_shard_hits, month_key
 
 logger = logging.getLogger("dental_assistant.rag.pipelines")
 
+# Max consultations embedded + written per indexer run.  Saves are queued and
+# flushed by a background thread, so bursts share one model.encode() call and
+# one Chroma add() instead of one pipeline run each.
+_CONSULTATION_BATCH_SIZE = max(1, int(os.getenv("RAG_INDEX_BATCH_SIZE", "64")))
+
+# How long a save waits for its journal record to be fsynced
+_JOURNAL_WAIT_S = 10.0
+
+
+@functools.cache
+def _embedder_kwargs() -> dict:
+    """
+    Device/precision settings shared by every SentenceTransformers embedder.
+
+    On a CUDA machine the model runs on the GPU in fp16; otherwise the
+    Haystack defaults (CPU, fp32) apply.  Embeddings are deliberately not
+    normalized: existing collections and the shipped seed embeddings hold
+    raw vectors, and mixing the two would skew distances.
+    """
+    kwargs: dict = {"batch_size": 64}
+    try:
+        import torch
+        from haystack.utils import ComponentDevice
+
+        if torch.cuda.is_available():
+            kwargs["device"] = ComponentDevice.from_str("cuda:0")
+            kwargs["model_kwargs"] = {"torch_dtype": torch.float16}
+            logger.info("RAG embeddings on CUDA (fp16)")
+    except Exception as e:
+        logger.debug("CUDA embeddings unavailable, using CPU: %s", e)
+    return kwargs
+
+
+def _new_document_embedder():
+    from haystack.components.embedders import SentenceTransformersDocumentEmbedder
+
+    return SentenceTransformersDocumentEmbedder(model=EMBEDDING_MODEL, **_embedder_kwargs())
+
+
+def _new_text_embedder():
+    from haystack.components.embedders import SentenceTransformersTextEmbedder
+
+    return SentenceTransformersTextEmbedder(model=EMBEDDING_MODEL, **_embedder_kwargs())
+
+
+# Most recent monthly consultation shards searched per query, which bounds
+# the HNSW work per search as the history grows (0 = every shard, opt-in).
+# The shards are queried in parallel and their hits merged.
+_SEARCH_MONTHS = int(os.getenv("RAG_SEARCH_MONTHS", "12"))
+_SHARD_SEARCH_WORKERS = 4
+
+# Concurrent search queries arriving within this window are embedded together
+# in one forward pass (up to _QUERY_BATCH_MAX at a time)
+_QUERY_BATCH_WINDOW_S = int(os.getenv("RAG_QUERY_BATCH_MS", "5")) / 1000
+_QUERY_BATCH_MAX = 32
+
+# Consultation fields returned by search_consultations, in response order;
+# smartnote falls back to the document content, the others to "".
+_RESULT_DEFAULTS = dict.fromkeys(
+    ("smartnote", "transcription", "date", "date_display",
+     "dentist_name", "consultation_type", "patient_id"),
+    "",
+)
+_RESULT_FIELDS = frozenset(_RESULT_DEFAULTS)
+
+
+def _stable_id(key: str) -> str:
+    """128-bit document ID derived from ``key``."""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _consultation_document(record: dict) -> Document:
+    """
+    Build the Chroma document for a journal record.
+
+    The ID comes from (patient_id, date), so a rebuild from the journal
+    overwrites rather than duplicates what is already indexed, and writes
+    can use DuplicatePolicy.OVERWRITE (a plain upsert, no existence check).
+    """
+    smartnote = record.get("smartnote", "")
+    transcription = record.get("transcription", "")
+    content = smartnote
+    if transcription:
+        content = f"{smartnote}\n\n---\nTranscription:\n{transcription}"
+    return Document(
+        id=_stable_id(record.get("patient_id", "") + record.get("date", "")),
+        content=content,
+        meta={"type": "consultation", **record},
+    )
+
+
+def _source_prefix(meta: dict) -> str:
+    """The "[source - category]" header a knowledge document gets in RAG context."""
+    source = meta.get("source", "Reference")
+    category = meta.get("category", "")
+    return f"[{source}]" if not category else f"[{source} - {category}]"
+
+
+# Formatted RAG contexts kept for repeated transcriptions (retries, re-runs of
+# the same note), so those skip the query embedding and the Chroma lookup.
+_RAG_CONTEXT_CACHE_SIZE = 256
+
 
 class DentalRAGPipeline:
     """
@@ -30,32 +139,36 @@ class DentalRAGPipeline:
     - search_consultations(): semantic search across past notes
     - get_rag_context(): retrieve relevant knowledge for a transcription
     - index_knowledge(): add dental guidelines/protocols to knowledge base
-    """
 
-    _instance: Optional["DentalRAGPipeline"] = None
-    _instance_lock = threading.Lock()
+    Use get_rag_pipeline() for the process-wide instance.
+    """
 
-    def __new__(cls) -> "DentalRAGPipeline":
-        if cls._instance is None:
-            with cls._instance_lock:
-                if cls._instance is None:
-                    inst = super().__new__(cls)
-                    inst._initialized = False
-                    cls._instance = inst
-        return cls._instance
+    def __init__(self) -> None:
+        self._initialized = False
+        self._init_lock = threading.Lock()
 
     def initialize(self, store: DentalDocumentStore) -> None:
         """Build all pipelines. Call after DentalDocumentStore.initialize()."""
         if self._initialized:
             return
 
-        with self._instance_lock:
+        with self._init_lock:
             if self._initialized:
                 return
 
             self._store = store
+            # (blake2b(transcription), top_k) -> formatted context, LRU order
+            self._context_cache: OrderedDict[tuple[bytes, int], str] = OrderedDict()
+            self._context_cache_lock = threading.Lock()
+            self._knowledge_count: Optional[int] = None
+            # Exact in-memory index over the knowledge embeddings, built on
+            # first use (None = not built yet, False = unavailable)
+            self._knowledge_index = None
+            self._knowledge_index_lock = threading.Lock()
             self._build_consultation_pipelines()
             self._build_knowledge_pipelines()
+            self._warm_up()
+            self._start_consultation_flusher()
             self._initialized = True
             logger.info("RAG pipelines initialized")
 
@@ -63,51 +176,147 @@ class DentalRAGPipeline:
     def is_ready(self) -> bool:
         return self._initialized
 
+    def _warm_up(self) -> None:
+        """
+        Load the embedding model now rather than on the first request.
+
+        Haystack components can't be shared between pipelines, but every
+        embedder here is built with the same model and settings, so they all
+        resolve to one cached SentenceTransformers backend: the model is
+        loaded (and held in memory) once.
+        """
+        self._consultation_embedder.warm_up()
+        self._query_batch_embedder.warm_up()
+        for pipeline in (self._knowledge_indexer, self._knowledge_retriever):
+            pipeline.warm_up()
+
     # ------------------------------------------------------------------
     # Consultation pipelines
     # ------------------------------------------------------------------
 
     def _build_consultation_pipelines(self) -> None:
-        """Build indexing and search pipelines for consultations."""
-        from haystack.components.embedders import (
-            SentenceTransformersDocumentEmbedder,
-            SentenceTransformersTextEmbedder,
-        )
-        from haystack_integrations.components.retrievers.chroma import (
-            ChromaEmbeddingRetriever,
-        )
+        """
+        Build the consultation embedders.
 
-        # Indexing pipeline: embed + write consultation documents
-        self._consultation_indexer = Pipeline()
-        self._consultation_indexer.add_component(
-            "embedder",
-            SentenceTransformersDocumentEmbedder(model=EMBEDDING_MODEL),
-        )
-        self._consultation_indexer.add_component(
-            "writer",
-            DocumentWriter(
-                document_store=self._store.consultations,
-                policy=DuplicatePolicy.SKIP,
-            ),
+        Consultations live in one Chroma collection per month, so instead of
+        pipelines bound to a single store the embedders run on their own and
+        the store picks the shard(s) to write to / search.
+        """
+        self._consultation_embedder = _new_document_embedder()
+        # Queries go through a document embedder so several can share a batch;
+        # with no prefix/meta fields it yields the same vectors as the text one
+        self._query_batch_embedder = _new_document_embedder()
+        self._query_queue: "queue.SimpleQueue[tuple[str, Future]]" = queue.SimpleQueue()
+        threading.Thread(
+            target=self._query_batch_loop, name="rag-query-batcher", daemon=True
+        ).start()
+        self._shard_executor = ThreadPoolExecutor(
+            max_workers=_SHARD_SEARCH_WORKERS, thread_name_prefix="rag-shard-search"
         )
-        self._consultation_indexer.connect("embedder.documents", "writer.documents")
 
-        # Search pipeline: embed query + retrieve similar consultations
-        self._consultation_searcher = Pipeline()
-        self._consultation_searcher.add_component(
-            "embedder",
-            SentenceTransformersTextEmbedder(model=EMBEDDING_MODEL),
-        )
-        self._consultation_searcher.add_component(
-            "retriever",
-            ChromaEmbeddingRetriever(
-                document_store=self._store.consultations,
-                top_k=10,
-            ),
-        )
-        self._consultation_searcher.connect(
-            "embedder.embedding", "retriever.query_embedding"
+    def _embed_query(self, query: str) -> list[float]:
+        """Embed a search query, batched with any concurrent ones."""
+        future: Future = Future()
+        self._query_queue.put((query, future))
+        return future.result()
+
+    def _query_batch_loop(self) -> None:
+        """Collect queries for up to _QUERY_BATCH_WINDOW_S and embed them together."""
+        while True:
+            batch = [self._query_queue.get()]
+            deadline = time.monotonic() + _QUERY_BATCH_WINDOW_S
+            while len(batch) < _QUERY_BATCH_MAX:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._query_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                documents = self._query_batch_embedder.run(
+                    documents=[Document(content=query) for query, _ in batch]
+                )["documents"]
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), doc in zip(batch, documents):
+                future.set_result(doc.embedding)
+
+    def _index_consultations(self, documents: list[Document]) -> int:
+        """Embed consultations in one batch and write each to its month's shard."""
+        embedded = self._consultation_embedder.run(documents=documents)["documents"]
+        by_month: dict[str, list[Document]] = {}
+        for doc in embedded:
+            by_month.setdefault(month_key(doc.meta.get("date", "")), []).append(doc)
+        for month, docs in by_month.items():
+            self._store.consultation_shard(month).write_documents(
+                docs, policy=DuplicatePolicy.OVERWRITE
+            )
+        return len(embedded)
+
+    # ------------------------------------------------------------------
+    # Batched consultation indexing
+    # ------------------------------------------------------------------
+
+    def _start_consultation_flusher(self) -> None:
+        """Start the background thread that indexes queued consultations."""
+        self._pending_consultations: deque[Document] = deque()
+        self._write_lock = threading.Lock()
+        # Signalled (under _write_lock) whenever a batch finishes
+        self._batch_done = threading.Condition(self._write_lock)
+        self._in_flight = 0
+        self._flush_event = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="rag-consultation-indexer", daemon=True
         )
+        self._flusher.start()
+
+    def _enqueue_consultation(self, doc: Document) -> None:
+        with self._write_lock:
+            self._pending_consultations.append(doc)
+        self._flush_event.set()
+
+    def _flush_loop(self) -> None:
+        """Drain queued consultations in batches of up to _CONSULTATION_BATCH_SIZE."""
+        while True:
+            self._flush_event.wait()
+            self._flush_event.clear()
+            while True:
+                with self._write_lock:
+                    pending = self._pending_consultations
+                    if not pending:
+                        break
+                    batch = [pending.popleft() for _ in range(min(len(pending), _CONSULTATION_BATCH_SIZE))]
+                    self._in_flight = len(batch)
+                try:
+                    self._index_consultations(batch)
+                    logger.info("Indexed %d consultation(s)", len(batch))
+                except Exception as e:
+                    # The journal already has the records — ChromaDB can be rebuilt.
+                    logger.exception(
+                        "ChromaDB indexing failed for %d consultation(s) (journal has the records): %s",
+                        len(batch), e,
+                    )
+                finally:
+                    with self._write_lock:
+                        self._in_flight = 0
+                        self._batch_done.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every queued consultation has been indexed.
+
+        Returns False if the timeout expired first.
+        """
+        if not self._initialized:
+            return True
+        with self._write_lock:
+            return self._batch_done.wait_for(
+                lambda: not self._pending_consultations and not self._in_flight,
+                timeout,
+            )
 
     def save_consultation(
         self,
@@ -121,13 +330,20 @@ class DentalRAGPipeline:
         Save a completed SmartNote to the consultation archive.
 
         Write order (write-ahead):
-        1. Append to the JSONL journal — the durable, authoritative record.
-        2. Index into ChromaDB — the searchable vector index (rebuildable).
+        1. Append to the JSONL journal — the durable, authoritative record —
+           and wait for its group commit (concurrent saves share one fsync).
+        2. Queue for ChromaDB — the searchable vector index (rebuildable).
+           The background indexer embeds and writes queued notes in batches;
+           call flush() to wait for them.
+
+        "saved" is only returned once the journal record is on disk; if it
+        can't be written, nothing is indexed either.
         """
         if not self._initialized:
             return {"status": "error", "detail": "RAG not initialized"}
 
         now = datetime.now()
+        date = now.isoformat()
 
         record = {
             "smartnote": smartnote,
@@ -135,41 +351,28 @@ class DentalRAGPipeline:
             "dentist_name": dentist_name,
             "consultation_type": consultation_type,
             "patient_id": patient_id,
-            "date": now.isoformat(),
-            "date_display": now.strftime("%d/%m/%Y %H:%M"),
+            "date": date,
+            # Same as strftime("%d/%m/%Y %H:%M"), minus the locale-aware formatter
+            "date_display": f"{now.day:02d}/{now.month:02d}/{now.year} {now.hour:02d}:{now.minute:02d}",
         }
 
         # --- 1. Journal (durable flat-file) ---------------------------------
         from app.rag.journal import append as journal_append
 
         try:
-            journal_append(record)
+            durable = journal_append(record).wait(_JOURNAL_WAIT_S)
         except Exception:
             logger.exception("CRITICAL: journal write failed — aborting save")
             return {"status": "error", "detail": "Failed to write backup journal"}
+        if not durable:
+            logger.error("CRITICAL: journal write not confirmed within %.0fs — aborting save", _JOURNAL_WAIT_S)
+            return {"status": "error", "detail": "Failed to write backup journal"}
 
         # --- 2. ChromaDB index (rebuildable) ---------------------------------
-        content = smartnote
-        if transcription:
-            content = f"{smartnote}\n\n---\nTranscription:\n{transcription}"
+        self._enqueue_consultation(_consultation_document(record))
+        logger.info("Consultation saved: %s", date)
 
-        doc = Document(
-            content=content,
-            meta={"type": "consultation", **record},
-        )
-
-        try:
-            self._consultation_indexer.run(
-                {"embedder": {"documents": [doc]}}
-            )
-            logger.info("Consultation saved: %s", now.isoformat())
-        except Exception as e:
-            # The journal already has the record — ChromaDB can be rebuilt.
-            logger.exception(
-                "ChromaDB indexing failed (journal has the record): %s", e
-            )
-
-        return {"status": "saved", "date": now.isoformat()}
+        return {"status": "saved", "date": date}
 
     def search_consultations(self, query: str, top_k: int = 10) -> list[dict]:
         """
@@ -181,27 +384,29 @@ class DentalRAGPipeline:
             return []
 
         try:
-            result = self._consultation_searcher.run(
-                {
-                    "embedder": {"text": query},
-                    "retriever": {"top_k": top_k},
-                }
-            )
-            documents = result.get("retriever", {}).get("documents", [])
-
-            return [
-                {
-                    "smartnote": doc.meta.get("smartnote", doc.content),
-                    "transcription": doc.meta.get("transcription", ""),
-                    "date": doc.meta.get("date", ""),
-                    "date_display": doc.meta.get("date_display", ""),
-                    "dentist_name": doc.meta.get("dentist_name", ""),
-                    "consultation_type": doc.meta.get("consultation_type", ""),
-                    "patient_id": doc.meta.get("patient_id", ""),
-                    "score": doc.score if doc.score is not None else 0.0,
-                }
-                for doc in documents
-            ]
+            embedding = self._embed_query(query)
+            shards = self._store.consultation_shards(_SEARCH_MONTHS)
+
+            def search(shard) -> list[Document]:
+                return shard.search_embeddings([embedding], top_k=top_k)[0]
+
+            if len(shards) == 1:
+                hit_lists = [search(shards[0])]
+            else:
+                hit_lists = list(self._shard_executor.map(search, shards))
+
+            documents = merge_shard_hits(hit_lists, top_k)
+
+            results = []
+            for doc in documents:
+                meta = doc.meta
+                # Prefilled defaults, then only the result fields present in meta
+                item = _RESULT_DEFAULTS.copy()
+                item["smartnote"] = doc.content
+                item.update({key: meta[key] for key in meta.keys() & _RESULT_FIELDS})
+                item["score"] = doc.score if doc.score is not None else 0.0
+                results.append(item)
+            return results
         except Exception as e:
             logger.exception("Consultation search failed")
             return []
@@ -222,30 +427,24 @@ class DentalRAGPipeline:
         if not records:
             return {"status": "ok", "indexed": 0, "skipped": 0}
 
+        docs = [_consultation_document(rec) for rec in records if rec.get("smartnote")]
+        skipped = len(records) - len(docs)
         indexed = 0
-        skipped = 0
-        for rec in records:
-            smartnote = rec.get("smartnote", "")
-            if not smartnote:
-                skipped += 1
-                continue
-            transcription = rec.get("transcription", "")
-            content = smartnote
-            if transcription:
-                content = f"{smartnote}\n\n---\nTranscription:\n{transcription}"
-
-            doc = Document(
-                content=content,
-                meta={"type": "consultation", **rec},
-            )
+
+        # Same batches as live saves: one encode + one write per shard per batch
+        for start in range(0, len(docs), _CONSULTATION_BATCH_SIZE):
+            batch = docs[start:start + _CONSULTATION_BATCH_SIZE]
             try:
-                self._consultation_indexer.run(
-                    {"embedder": {"documents": [doc]}}
-                )
-                indexed += 1
+                indexed += self._index_consultations(batch)
+                continue
             except Exception:
-                logger.warning("Failed to index journal record dated %s", rec.get("date"))
-                skipped += 1
+                logger.warning("Batch of %d journal records failed, retrying one by one", len(batch))
+            for doc in batch:
+                try:
+                    indexed += self._index_consultations([doc])
+                except Exception:
+                    logger.warning("Failed to index journal record dated %s", doc.meta.get("date"))
+                    skipped += 1
 
         logger.info("Journal rebuild: %d indexed, %d skipped", indexed, skipped)
         return {"status": "ok", "indexed": indexed, "skipped": skipped}
@@ -256,10 +455,6 @@ class DentalRAGPipeline:
 
     def _build_knowledge_pipelines(self) -> None:
         """Build indexing and retrieval pipelines for dental knowledge."""
-        from haystack.components.embedders import (
-            SentenceTransformersDocumentEmbedder,
-            SentenceTransformersTextEmbedder,
-        )
         from haystack_integrations.components.retrievers.chroma import (
             ChromaEmbeddingRetriever,
         )
@@ -268,22 +463,33 @@ class DentalRAGPipeline:
         self._knowledge_indexer = Pipeline()
         self._knowledge_indexer.add_component(
             "embedder",
-            SentenceTransformersDocumentEmbedder(model=EMBEDDING_MODEL),
+            _new_document_embedder(),
         )
         self._knowledge_indexer.add_component(
             "writer",
             DocumentWriter(
                 document_store=self._store.knowledge,
-                policy=DuplicatePolicy.SKIP,
+                policy=DuplicatePolicy.OVERWRITE,
             ),
         )
         self._knowledge_indexer.connect("embedder.documents", "writer.documents")
 
+        # Writer-only pipeline for documents that already carry embeddings
+        # (the precomputed seed corpus)
+        self._knowledge_writer = Pipeline()
+        self._knowledge_writer.add_component(
+            "writer",
+            DocumentWriter(
+                document_store=self._store.knowledge,
+                policy=DuplicatePolicy.OVERWRITE,
+            ),
+        )
+
         # Retrieval pipeline for RAG context
         self._knowledge_retriever = Pipeline()
         self._knowledge_retriever.add_component(
             "embedder",
-            SentenceTransformersTextEmbedder(model=EMBEDDING_MODEL),
+            _new_text_embedder(),
         )
         self._knowledge_retriever.add_component(
             "retriever",
@@ -301,12 +507,29 @@ class DentalRAGPipeline:
         if not self._initialized:
             return {"status": "error", "detail": "RAG not initialized"}
 
+        from app.rag.dental_knowledge import attach_seed_embeddings
+
+        for doc in documents:
+            doc.meta["_prefix"] = _source_prefix(doc.meta)
+            # Content-hash IDs: re-indexing the same guideline overwrites it
+            doc.id = _stable_id(doc.content)
+
         try:
-            result = self._knowledge_indexer.run(
-                {"embedder": {"documents": documents}}
-            )
+            if attach_seed_embeddings(documents):
+                result = self._knowledge_writer.run(
+                    {"writer": {"documents": documents}}
+                )
+            else:
+                result = self._knowledge_indexer.run(
+                    {"embedder": {"documents": documents}}
+                )
             written = result.get("writer", {}).get("documents_written", 0)
             logger.info("Indexed %d knowledge documents", written)
+            # New knowledge can change what any transcription retrieves
+            self._knowledge_count = None
+            self._knowledge_index = None
+            with self._context_cache_lock:
+                self._context_cache.clear()
             return {"status": "indexed", "documents_written": written}
         except Exception as e:
             logger.exception("Knowledge indexing failed")
@@ -322,32 +545,94 @@ class DentalRAGPipeline:
         if not self._initialized:
             return ""
 
-        # Check if knowledge base has documents
-        if self._store.knowledge.count_documents() == 0:
+        # Check if knowledge base has documents (counted once, then again
+        # only after index_knowledge() writes)
+        if self._knowledge_count is None:
+            self._knowledge_count = self._store.knowledge.count_documents()
+        if self._knowledge_count == 0:
             return ""
 
+        key = (hashlib.blake2b(transcription.encode("utf-8"), digest_size=16).digest(), top_k)
+        with self._context_cache_lock:
+            cached = self._context_cache.get(key)
+            if cached is not None:
+                self._context_cache.move_to_end(key)
+                return cached
+
+        context = self._retrieve_rag_context(transcription, top_k)
+        if context is not None:
+            with self._context_cache_lock:
+                self._context_cache[key] = context
+                if len(self._context_cache) > _RAG_CONTEXT_CACHE_SIZE:
+                    self._context_cache.popitem(last=False)
+        return context or ""
+
+    def _get_knowledge_index(self):
+        """
+        The in-memory knowledge index, built from Chroma on first use.
+
+        Returns None if it can't be built (numpy missing, Chroma error), in
+        which case retrieval goes through the Chroma retriever pipeline.
+        """
+        index = self._knowledge_index
+        if index is None:
+            with self._knowledge_index_lock:
+                index = self._knowledge_index
+                if index is None:
+                    index = self._knowledge_index = self._build_knowledge_index()
+        return index or None
+
+    def _build_knowledge_index(self):
         try:
-            result = self._knowledge_retriever.run(
-                {
-                    "embedder": {"text": transcription},
-                    "retriever": {"top_k": top_k},
-                }
-            )
-            documents = result.get("retriever", {}).get("documents", [])
+            from app.rag.flat_index import FlatL2Index
+
+            documents = self._store.knowledge.filter_documents()
+            missing = [doc for doc in documents if doc.embedding is None]
+            if missing:
+                # The store didn't hand back vectors: embed once, in one batch
+                embedded = self._knowledge_indexer.get_component("embedder").run(
+                    documents=missing
+                )["documents"]
+                by_id = {doc.id: doc for doc in embedded}
+                documents = [by_id.get(doc.id, doc) for doc in documents]
+            index = FlatL2Index(documents)
+            logger.info("In-memory knowledge index built (%d documents)", len(index))
+            return index
+        except Exception as e:
+            logger.warning("In-memory knowledge index unavailable, using Chroma: %s", e)
+            return False
+
+    def _retrieve_rag_context(self, transcription: str, top_k: int) -> Optional[str]:
+        """Embed + retrieve + format the RAG context; None if retrieval failed."""
+        try:
+            index = self._get_knowledge_index()
+            if index is not None:
+                documents = index.search(self._embed_query(transcription), top_k)
+            else:
+                result = self._knowledge_retriever.run(
+                    {
+                        "embedder": {"text": transcription},
+                        "retriever": {"top_k": top_k},
+                    }
+                )
+                documents = result.get("retriever", {}).get("documents", [])
 
             if not documents:
                 return ""
 
-            # Format retrieved context for the LLM prompt
-            context_parts = []
-            for i, doc in enumerate(documents, 1):
-                source = doc.meta.get("source", "Reference")
-                category = doc.meta.get("category", "")
-                prefix = f"[{source}]" if not category else f"[{source} - {category}]"
-                context_parts.append(f"{prefix}\n{doc.content}")
-
-            return "\n\n".join(context_parts)
+            # Format retrieved context for the LLM prompt (prefixes were
+            # stored at index time; older documents get them computed here)
+            return "\n\n".join([
+                (doc.meta.get("_prefix") or _source_prefix(doc.meta)) + "\n" + doc.content
+                for doc in documents
+            ])
 
         except Exception as e:
             logger.warning("RAG context retrieval failed: %s", e)
-            return ""
+            return None
+
+
+@functools.cache
+def get_rag_pipeline() -> DentalRAGPipeline:
+    """Return the process-wide RAG pipeline (created on first call)."""
+    return DentalRAGPipeline()
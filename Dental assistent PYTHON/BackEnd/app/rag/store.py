@@ -3,47 +3,68 @@ Persistent document store for dental consultations and knowledge base.
 
 Uses ChromaDB via Haystack for local-first vector storage.
 All data stays on the machine - no cloud services required.
+
+Consultations are sharded into one Chroma collection per month
+(``consultations_YYYYMM``) so each HNSW index stays small; the original
+single ``consultations`` collection is kept as a read-only legacy shard.
 """
 
+import functools
+import heapq
 import logging
+import math
+import re
 import threading
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
-from typing import Optional
 
 logger = logging.getLogger("dental_assistant.rag.store")
 
 # Embedding model: multilingual for French dental terminology
 EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
 
+# Collection holding every consultation indexed before monthly sharding
+LEGACY_CONSULTATIONS = "consultations"
+_SHARD_RE = re.compile(r"consultations_(\d{6})")
+
+
+def month_key(date_iso: str = "") -> str:
+    """YYYYMM shard key for an ISO date (the current month if empty)."""
+    if len(date_iso) >= 7:
+        return date_iso[:4] + date_iso[5:7]
+    return datetime.now().strftime("%Y%m")
+
+
+def merge_shard_hits(hit_lists, top_k: int) -> list:
+    """Merge per-shard search hits into the *top_k* closest (Chroma scores are distances)."""
+    return heapq.nsmallest(
+        top_k,
+        chain.from_iterable(hit_lists),
+        key=lambda doc: doc.score if doc.score is not None else math.inf,
+    )
+
 
 class DentalDocumentStore:
     """
-    Singleton wrapper around ChromaDB-backed Haystack document store.
+    Wrapper around ChromaDB-backed Haystack document store.
+    Use get_document_store() for the process-wide instance.
 
     Manages two collections:
     - consultations: past SmartNotes for history & semantic search
     - knowledge: dental guidelines, protocols, drug databases
     """
 
-    _instance: Optional["DentalDocumentStore"] = None
-    _instance_lock = threading.Lock()
-
-    def __new__(cls, persist_dir: Optional[Path] = None) -> "DentalDocumentStore":
-        if cls._instance is None:
-            with cls._instance_lock:
-                if cls._instance is None:
-                    inst = super().__new__(cls)
-                    inst._initialized = False
-                    cls._instance = inst
-        return cls._instance
+    def __init__(self) -> None:
+        self._initialized = False
+        self._init_lock = threading.Lock()
 
     def initialize(self, persist_dir: Path) -> None:
         """Lazy initialization - avoids heavy imports at module load time."""
         if self._initialized:
             return
 
-        with self._instance_lock:
+        with self._init_lock:
             if self._initialized:
                 return
 
@@ -55,10 +76,14 @@ class DentalDocumentStore:
                 self._persist_dir = persist_dir
                 persist_dir.mkdir(parents=True, exist_ok=True)
 
-                self._consultations_store = ChromaDocumentStore(
-                    collection_name="consultations",
-                    persist_path=str(persist_dir / "consultations"),
-                )
+                self._store_cls = ChromaDocumentStore
+                self._consultations_path = str(persist_dir / "consultations")
+                self._shards_lock = threading.Lock()
+                # shard name -> ChromaDocumentStore, created lazily
+                self._consultation_shards: dict[str, ChromaDocumentStore] = {}
+                self._consultations_store = self._open_shard(LEGACY_CONSULTATIONS)
+                for month in self._existing_months():
+                    self._open_shard(f"consultations_{month}")
                 self._knowledge_store = ChromaDocumentStore(
                     collection_name="knowledge",
                     persist_path=str(persist_dir / "knowledge"),
@@ -82,11 +107,60 @@ class DentalDocumentStore:
 
     @property
     def consultations(self):
-        """Access the consultations document store."""
+        """Access the legacy (pre-sharding) consultations document store."""
         if not self._initialized:
             raise RuntimeError("Document store not initialized. Call initialize() first.")
         return self._consultations_store
 
+    def _open_shard(self, name: str):
+        with self._shards_lock:
+            shard = self._consultation_shards.get(name)
+            if shard is None:
+                shard = self._consultation_shards[name] = self._store_cls(
+                    collection_name=name,
+                    persist_path=self._consultations_path,
+                )
+            return shard
+
+    def _existing_months(self) -> list[str]:
+        """Months that already have a consultation shard on disk."""
+        try:
+            import chromadb
+
+            client = chromadb.PersistentClient(path=self._consultations_path)
+            names = [c if isinstance(c, str) else c.name for c in client.list_collections()]
+        except Exception as e:
+            logger.warning("Could not list consultation shards: %s", e)
+            return []
+        return sorted(m.group(1) for m in map(_SHARD_RE.fullmatch, names) if m)
+
+    def consultation_shard(self, month: str):
+        """The consultations store for a YYYYMM month (created on first write)."""
+        if not self._initialized:
+            raise RuntimeError("Document store not initialized. Call initialize() first.")
+        return self._open_shard(f"consultations_{month}")
+
+    def consultation_shards(self, months: int = 0) -> list:
+        """
+        Consultation stores to search, newest month first.
+
+        ``months`` > 0 limits the search to that many most recent monthly
+        shards.  The legacy pre-sharding collection only holds consultations
+        older than every monthly shard, so it is searched last, and only
+        while fewer than ``months`` monthly shards exist.  ``months`` = 0
+        searches everything.
+        """
+        if not self._initialized:
+            raise RuntimeError("Document store not initialized. Call initialize() first.")
+        with self._shards_lock:
+            monthly = sorted(
+                (name for name in self._consultation_shards if name != LEGACY_CONSULTATIONS),
+                reverse=True,
+            )
+            if months > 0 and len(monthly) >= months:
+                return [self._consultation_shards[name] for name in monthly[:months]]
+            return [self._consultation_shards[name] for name in monthly] + [self._consultations_store]
+
     @property
     def knowledge(self):
         """Access the knowledge base document store."""
@@ -104,7 +178,15 @@ class DentalDocumentStore:
             }
         return {
             "initialized": True,
-            "consultations_count": self._consultations_store.count_documents(),
+            "consultations_count": sum(
+                shard.count_documents() for shard in self.consultation_shards()
+            ),
             "knowledge_count": self._knowledge_store.count_documents(),
             "persist_dir": str(self._persist_dir),
         }
+
+
+@functools.cache
+def get_document_store() -> DentalDocumentStore:
+    """Return the process-wide document store (created on first call)."""
+    return DentalDocumentStore()
@@ -0,0 +1,144 @@
+"""
+Redis-backed distributed semaphore for the worker pools.
+
+With several backend processes (uvicorn --workers N, or several containers)
+the in-process CapacityLimiter in app.worker only bounds one process, so
+RAG_CONCURRENCY=2 really means 2 x N.  When REDIS_URL is set each pool also
+takes a slot from a semaphore shared by every process:
+
+- The semaphore is a ZSET ``sem:{name}``; each holder is a member
+  ``host:pid:uuid`` whose score is its lease expiry (Redis server time).
+- acquire.lua drops expired holders, then adds the caller if ZCARD < limit.
+- A background task renews the lease every TTL/3, so a killed worker's slot
+  frees itself once its lease runs out.
+- release.lua removes the member.
+
+Requires the optional ``redis`` package (redis>=4.2 for redis.asyncio).
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+
+logger = logging.getLogger("dental_assistant.redis_semaphore")
+
+# Lease length for a held slot; renewed every third of it while work runs.
+_LEASE_TTL_S = float(os.getenv("REDIS_SEMAPHORE_TTL_S", "30"))
+
+# Polling backoff while every slot is taken.
+_POLL_MIN_S = 0.05
+_POLL_MAX_S = 0.5
+
+# KEYS[1] = zset; ARGV = member, limit, ttl_s
+_ACQUIRE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[1])
+    redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[3])) * 2)
+    return 1
+end
+return 0
+"""
+
+# KEYS[1] = zset; ARGV = member, ttl_s
+_RENEW_LUA = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return 0
+end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('ZADD', KEYS[1], 'XX', now + tonumber(ARGV[2]), ARGV[1])
+redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[2])) * 2)
+return 1
+"""
+
+# KEYS[1] = zset; ARGV = member
+_RELEASE_LUA = """
+return redis.call('ZREM', KEYS[1], ARGV[1])
+"""
+
+
+class RedisSemaphore:
+    """Cluster-wide counting semaphore named *name* with *limit* slots."""
+
+    def __init__(self, client, name: str, limit: int, ttl: float = _LEASE_TTL_S):
+        self.name = name
+        self.limit = limit
+        self.ttl = ttl
+        self._key = f"sem:{name}"
+        self._acquire = client.register_script(_ACQUIRE_LUA)
+        self._renew = client.register_script(_RENEW_LUA)
+        self._release = client.register_script(_RELEASE_LUA)
+        self._prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._renewers: dict[str, asyncio.Task] = {}
+        # Releases fired for abandoned acquires (kept so they aren't GC'd)
+        self._cleanups: set[asyncio.Task] = set()
+
+    async def acquire(self) -> str:
+        """Wait for a slot and return its token (cancel the caller to give up)."""
+        member = f"{self._prefix}:{uuid.uuid4().hex}"
+        delay = _POLL_MIN_S
+        try:
+            while not await self._acquire(keys=[self._key], args=[member, self.limit, self.ttl]):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _POLL_MAX_S)
+        except BaseException:
+            # Cancelled (or failed) with the script possibly already run: the
+            # caller never gets the token, so give the slot back ourselves
+            # rather than leaving it taken until the lease expires.
+            self._release_abandoned(member)
+            raise
+        self._renewers[member] = asyncio.create_task(self._keep_alive(member))
+        return member
+
+    def _release_abandoned(self, member: str) -> None:
+        async def release() -> None:
+            try:
+                await self._release(keys=[self._key], args=[member])
+            except Exception as e:
+                logger.debug("Could not release abandoned %s slot: %s", self.name, e)
+
+        try:
+            task = asyncio.get_running_loop().create_task(release())
+        except RuntimeError:  # loop shutting down; the lease expires on its own
+            return
+        self._cleanups.add(task)
+        task.add_done_callback(self._cleanups.discard)
+
+    async def release(self, token: str) -> None:
+        task = self._renewers.pop(token, None)
+        if task is not None:
+            task.cancel()
+        try:
+            await self._release(keys=[self._key], args=[token])
+        except Exception as e:
+            # The lease expires on its own; just don't hold up the caller
+            logger.warning("Could not release %s slot (expires in <=%.0fs): %s", self.name, self.ttl, e)
+
+    async def _keep_alive(self, token: str) -> None:
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                if not await self._renew(keys=[self._key], args=[token, self.ttl]):
+                    logger.warning("Lost %s slot lease (expired before renewal)", self.name)
+                    return
+            except Exception as e:
+                logger.warning("Renewing %s slot lease failed: %s", self.name, e)
+
+
+def semaphore_from_env(name: str, limit: int) -> RedisSemaphore | None:
+    """Return a RedisSemaphore when REDIS_URL is set and redis is installed, else None."""
+    url = os.getenv("REDIS_URL")
+    if not url:
+        return None
+    try:
+        import redis.asyncio as aioredis
+    except ImportError:
+        logger.warning("REDIS_URL is set but the redis package is not installed; "
+                       "pool '%s' is limited per process only", name)
+        return None
+    return RedisSemaphore(aioredis.from_url(url), name, limit)
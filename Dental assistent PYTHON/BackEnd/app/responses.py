@@ -0,0 +1,19 @@
+"""
+JSON response class backed by orjson.
+
+Used as the app's default_response_class and by the error handlers, so
+every JSON body is encoded straight to bytes by orjson instead of going
+through json.dumps() and a separate UTF-8 encode.  (FastAPI's own
+ORJSONResponse is deprecated in recent releases; this is the same thing
+on top of Starlette's JSONResponse.)
+"""
+
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -4,7 +4,127 @@ Shared input-sanitization helper.
 Used by summarize and RAG routers to clean user text before LLM processing.
 """
 
+import logging
 import re
+import threading
+
+try:
+    import hyperscan
+except ImportError:  # optional: plain `re` is used on its own
+    hyperscan = None
+
+try:
+    import re2  # google-re2: linear-time matching, no backtracking
+except ImportError:
+    re2 = None
+
+logger = logging.getLogger("dental_assistant.sanitize")
+
+# Potential prompt injection patterns (basic protection)
+_INJECTION_PATTERNS = (
+    r'ignore\s+(all\s+)?(previous|above)\s+instructions?',
+    r'disregard\s+(all\s+)?(previous|above)',
+    r'forget\s+(everything|all)',
+    r'you\s+are\s+now\s+a',
+    r'new\s+instructions?:',
+    r'system\s*:\s*',
+)
+
+# Control characters (except tab/newline/CR).  str.translate strips them
+# from ASCII text ~7x faster than the regex, but it drops to a per-character
+# slow path on non-ASCII text (i.e. most French transcripts), where the
+# regex is ~10x faster -- so sanitize_input picks one by text.isascii().
+_CTRL_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), 0x7f])
+_CTRL_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+
+# Compiled once at import; the injection patterns are fused into a single
+# alternation so the text is scanned once rather than once per pattern.
+_INJECTION_ALTERNATION = "|".join(f"(?:{p})" for p in _INJECTION_PATTERNS)
+# RE2's \s is ASCII-only; \p{Z} adds the Unicode spaces Python's \s matches
+# (NBSP and narrow NBSP are routine in French typography: "système :").
+_RE2_INJECTION_ALTERNATION = _INJECTION_ALTERNATION.replace(r"\s", r"[\s\p{Z}]")
+
+
+def _compile_injection_re():
+    """
+    Compile the fused injection pattern, preferring RE2 when installed.
+
+    RE2 runs in time linear in the input whatever the text looks like, so an
+    adversarial transcript can't make the filter backtrack.  Its variant of
+    the pattern spells whitespace as [\\s\\p{Z}] so it matches the same
+    Unicode spaces as Python's \\s.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile("(?i)" + _RE2_INJECTION_ALTERNATION)
+        except Exception as e:
+            logger.warning("RE2 rejected the injection patterns, using re: %s", e)
+    return re.compile(_INJECTION_ALTERNATION, re.IGNORECASE)
+
+
+_INJECTION_RE = _compile_injection_re()
+
+# Only whitespace runs that actually change: a space followed by more
+# spaces/tabs, or any tab.  `[ \t]+` also matched (and rewrote) every single
+# space, which made this the slowest pass on long transcripts.
+_WS_RE = re.compile(r' [ \t]+|\t[ \t]*')
+_NL_RE = re.compile(r'\n{4,}')
+
+
+def _build_injection_db():
+    """
+    Compile the injection patterns into a Hyperscan database, if available.
+
+    Hyperscan is only a prefilter: it answers "does anything match?" in one
+    SIMD pass over the bytes, and the (rare) texts that do match still go
+    through _INJECTION_RE for the actual replacement.
+    """
+    if hyperscan is None:
+        return None
+    flags = (
+        hyperscan.HS_FLAG_CASELESS
+        | hyperscan.HS_FLAG_SINGLEMATCH
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP   # Unicode \s, like Python's re
+    )
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[p.encode("ascii") for p in _INJECTION_PATTERNS],
+            ids=list(range(len(_INJECTION_PATTERNS))),
+            flags=[flags] * len(_INJECTION_PATTERNS),
+        )
+        return db
+    except Exception as e:
+        logger.warning("Hyperscan unavailable for sanitize_input, using re only: %s", e)
+        return None
+
+
+_INJECTION_DB = _build_injection_db()
+# Hyperscan scratch space is per-database and not safe to share between threads
+_INJECTION_DB_LOCK = threading.Lock()
+
+
+def _may_contain_injection(text: str) -> bool:
+    """Cheap pre-check before _INJECTION_RE.sub (always True without Hyperscan)."""
+    if _INJECTION_DB is None:
+        return True
+    matched = []
+
+    def on_match(pattern_id, start, end, flags, context):
+        matched.append(pattern_id)
+
+    with _INJECTION_DB_LOCK:
+        # "replace": lone surrogates would be invalid UTF-8, which Hyperscan's
+        # UTF-8 mode doesn't handle; "?" matches the same patterns as they do
+        _INJECTION_DB.scan(text.encode("utf-8", "replace"), match_event_handler=on_match)
+    return bool(matched)
+
+
+# Upper bound for transcription fields on the request models: anything
+# longer is rejected with 422 at validation, before any sanitizing work
+# (sanitize_input keeps only the first 50k characters anyway).
+MAX_TEXT_CHARS = 200_000
 
 
 def sanitize_input(text: str, max_length: int = 50000) -> str:
@@ -23,23 +143,15 @@ def sanitize_input(text: str, max_length: int = 50000) -> str:
     text = text[:max_length]
 
     # Remove control characters except newlines and tabs
-    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
-
-    # Remove potential prompt injection patterns (basic protection)
-    injection_patterns = [
-        r'(?i)ignore\s+(all\s+)?(previous|above)\s+instructions?',
-        r'(?i)disregard\s+(all\s+)?(previous|above)',
-        r'(?i)forget\s+(everything|all)',
-        r'(?i)you\s+are\s+now\s+a',
-        r'(?i)new\s+instructions?:',
-        r'(?i)system\s*:\s*',
-    ]
+    text = text.translate(_CTRL_TABLE) if text.isascii() else _CTRL_RE.sub('', text)
 
-    for pattern in injection_patterns:
-        text = re.sub(pattern, '[FILTERED]', text)
+    # Remove potential prompt injection patterns
+    if _may_contain_injection(text):
+        text = _INJECTION_RE.sub('[FILTERED]', text)
 
     # Normalize excessive whitespace (but keep structure)
-    text = re.sub(r'[ \t]+', ' ', text)  # Multiple spaces/tabs to single space
-    text = re.sub(r'\n{4,}', '\n\n\n', text)  # Max 3 consecutive newlines
+    text = _WS_RE.sub(' ', text)  # Multiple spaces/tabs to single space
+    if '\n\n\n\n' in text:
+        text = _NL_RE.sub('\n\n\n', text)  # Max 3 consecutive newlines
 
     return text.strip()
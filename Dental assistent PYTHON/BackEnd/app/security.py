@@ -1,7 +1,9 @@
 from fastapi.security.api_key import APIKeyHeader
 from fastapi import Security
+import hmac
 import os
 import logging
+import time
 
 from app.errors import AppError, AUTH_INVALID_KEY, AUTH_NOT_CONFIGURED
 
@@ -12,10 +14,40 @@ logger = logging.getLogger("dental_assistant.security")
 DEFAULT_DEV_KEY = "dental-assistant-local-dev-key"
 
 # Centralized auth helpers to avoid circular imports
-# Read the API key at verification time (not import time) so tests and
-# runtime which set APP_API_KEY after import continue to work.
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=True)
 
+# Expected key as bytes, snapshotted from APP_API_KEY.  Startup
+# (validate_security_config) and tests that change the env var after import
+# refresh it with reload_api_key().
+_EXPECTED_KEY = os.getenv("APP_API_KEY", DEFAULT_DEV_KEY).encode("utf-8")
+
+
+# Failed key checks are logged at most once per window (with a count), so a
+# brute-force probe can't turn the log handler into the bottleneck.
+_BAD_KEY_LOG_INTERVAL_S = 5.0
+_bad_key_attempts = 0
+_bad_key_logged_at = float("-inf")
+
+
+def _note_bad_key() -> None:
+    global _bad_key_attempts, _bad_key_logged_at
+    _bad_key_attempts += 1
+    now = time.monotonic()
+    if now - _bad_key_logged_at >= _BAD_KEY_LOG_INTERVAL_S:
+        logger.warning(
+            "[%s] Invalid API key attempt (%d since last report)",
+            AUTH_INVALID_KEY.code,
+            _bad_key_attempts,
+        )
+        _bad_key_attempts = 0
+        _bad_key_logged_at = now
+
+
+def reload_api_key() -> None:
+    """Re-read APP_API_KEY into the key used by verify_api_key()."""
+    global _EXPECTED_KEY
+    _EXPECTED_KEY = os.getenv("APP_API_KEY", DEFAULT_DEV_KEY).encode("utf-8")
+
 
 def is_production_mode() -> bool:
     """
@@ -32,6 +64,8 @@ def validate_security_config():
     Validate security configuration at startup.
     Raises RuntimeError in production if API key is not configured.
     """
+    reload_api_key()
+
     if is_production_mode() and not check_api_key_configured():
         raise RuntimeError(
             f"[{AUTH_NOT_CONFIGURED.code}] {AUTH_NOT_CONFIGURED.message}"
@@ -52,10 +86,10 @@ async def verify_api_key(api_key: str = Security(api_key_header)):
     Raises:
         AppError: AUTH_INVALID_KEY if the key does not match.
     """
-    expected = os.getenv("APP_API_KEY", DEFAULT_DEV_KEY)
-
-    if api_key != expected:
-        logger.warning("[%s] Invalid API key attempt", AUTH_INVALID_KEY.code)
+    # Constant-time comparison: no timing signal about how much of the key matched.
+    # The header dependency guarantees a str, but never crash on a missing key.
+    if not hmac.compare_digest((api_key or "").encode("utf-8"), _EXPECTED_KEY):
+        _note_bad_key()
         raise AppError(AUTH_INVALID_KEY)
 
     return api_key
@@ -0,0 +1,48 @@
+"""
+Server-Sent Events helpers for the SmartNote streaming endpoints.
+
+Frames are built as bytes (StreamingResponse sends them as-is), and
+generated tokens are coalesced into a few per frame: one JSON encode and
+one socket write per handful of tokens instead of per token.
+"""
+
+from typing import AsyncIterator
+
+import orjson
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+SSE_DONE = b"data: [DONE]\n\n"
+
+# Flush a frame once this many characters are buffered (~3-4 tokens), or
+# as soon as a token ends a line, so the text still appears line by line.
+_MIN_FRAME_CHARS = 16
+
+
+def sse_event(payload: dict) -> bytes:
+    """Encode *payload* as one ``data:`` frame."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+def sse_chunk(text: str) -> bytes:
+    """Encode a ``{"chunk": text}`` frame."""
+    return b'data: {"chunk":' + orjson.dumps(text) + b"}\n\n"
+
+
+async def coalesce_tokens(tokens: AsyncIterator[str], min_chars: int = _MIN_FRAME_CHARS) -> AsyncIterator[str]:
+    """Re-yield *tokens* joined into pieces of at least *min_chars* characters."""
+    buf: list[str] = []
+    buf_len = 0
+    async for token in tokens:
+        buf.append(token)
+        buf_len += len(token)
+        if buf_len >= min_chars or token.endswith("\n"):
+            yield "".join(buf)
+            buf.clear()
+            buf_len = 0
+    if buf:
+        yield "".join(buf)
@@ -2,9 +2,12 @@
 Unified worker pool for CPU/GPU-heavy operations.
 
 Each heavy operation type (whisper, rag) gets a named pool with:
-- Bounded concurrency  (asyncio.Semaphore)
-- Thread-pool executor (so sync code never blocks the event loop)
-- Per-pool metrics      (running, queued, total, errors)
+- Bounded concurrency  (anyio.CapacityLimiter, strict FIFO)
+- Per-pool metrics      (running, queued, total, errors, queue-wait percentiles)
+
+All pools run their work on one process-wide thread executor (sized by
+THREAD_POOL_SIZE), which is also installed as the event loop's default
+executor so asyncio.to_thread() calls share the same threads.
 
 LLM inference keeps its own priority-aware gate (_InferenceGate in local_llm.py)
 because it needs priority ordering and cancellation — features the general pool
@@ -13,12 +16,14 @@ doesn't need.  Its status is included in the combined /workers/status endpoint.
 ┌───────────────────────────────────────────────────────────────┐
 │  HORIZONTAL SCALING PATH                                      │
 │                                                               │
-│  Current:  in-process  (asyncio.Semaphore + ThreadPoolExec)   │
+│  Current:  in-process  (CapacityLimiter + ThreadPoolExec)     │
 │                                                               │
 │  To scale out:                                                │
-│  1. Replace _Pool.run() internals with Celery task.delay()    │
+│  1. Set CELERY_BROKER_URL: _Pool.run() sends jobs to Celery   │
+│     (see app/celery_app.py)                                   │
 │  2. Workers become separate processes / containers             │
-│  3. Redis or RabbitMQ replaces asyncio.Semaphore              │
+│  3. Redis bounds each pool cluster-wide (set REDIS_URL, see   │
+│     app/redis_semaphore.py)                                   │
 │  4. The WorkerPool.run() interface stays identical             │
 │                                                               │
 │  Endpoints, middleware, and all callers need ZERO changes —   │
@@ -27,21 +32,59 @@ doesn't need.  Its status is included in the combined /workers/status endpoint.
 """
 
 import asyncio
-import functools
+import contextvars
 import logging
+import math
 import os
 import time
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from threading import Lock
 from typing import Any, Callable
 
+from anyio import CapacityLimiter, WouldBlock, fail_after
+
+from app.celery_app import celery_target, run_remote
+from app.errors import AppError, INFERENCE_BUSY
+from app.redis_semaphore import semaphore_from_env
+
 logger = logging.getLogger("dental_assistant.worker")
 
+# Callers allowed to queue per slot before new work is turned away with a
+# 503 instead of piling up behind the timeout (0 = unbounded).
+_QUEUE_FACTOR = int(os.getenv("WORKER_QUEUE_FACTOR", "4"))
+
+# Number of recent slot-acquire wait times kept per pool for the
+# queue_wait_p*_ms figures in status().
+_WAIT_SAMPLES = 1024
+
+
+def _available_cpus() -> int:
+    """CPUs this process may actually use: affinity mask, clipped to a cgroup v2 quota."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    try:
+        # "<quota> <period>" or "max <period>" inside a CPU-limited container
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+_CPUS = _available_cpus()
+
 
 # ---------------------------------------------------------------------------
 # Pool defaults (overridable via environment variables)
 # ---------------------------------------------------------------------------
 
+# Whisper saturates the machine on its own; RAG embedding scales with cores.
+
 _POOL_CONFIGS: dict[str, dict[str, Any]] = {
     "whisper": {
         "concurrency": int(os.getenv("WHISPER_CONCURRENCY", "1")),
@@ -49,24 +92,38 @@ _POOL_CONFIGS: dict[str, dict[str, Any]] = {
         "description": "Audio transcription (faster-whisper)",
     },
     "rag": {
-        "concurrency": int(os.getenv("RAG_CONCURRENCY", "2")),
+        "concurrency": int(os.getenv("RAG_CONCURRENCY", str(max(2, _CPUS // 2)))),
         "timeout": 60,
         "description": "RAG embedding & retrieval",
     },
 }
 
+# Size of the shared thread executor behind every pool and asyncio.to_thread()
+# (LLM generation, model downloads and validation).  Per-pool concurrency is
+# bounded by each pool's limiter, so the executor must fit every pool at full
+# concurrency plus the LLM slots and some to_thread() headroom -- otherwise a
+# job that already holds a pool slot queues here, outside its pool timeout,
+# and to_thread() callers stall behind long transcriptions.
+_TO_THREAD_HEADROOM = 4
+_THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", str(max(
+    min(32, _CPUS + 4),  # ThreadPoolExecutor's own default
+    sum(cfg["concurrency"] for cfg in _POOL_CONFIGS.values())
+    + int(os.getenv("LLM_CONCURRENCY", "1"))
+    + _TO_THREAD_HEADROOM,
+))))
+
 
 # ---------------------------------------------------------------------------
 # _Pool — a single named, bounded worker pool
 # ---------------------------------------------------------------------------
 
 class _Pool:
-    """Named pool with a concurrency semaphore and a dedicated thread executor."""
+    """Named pool with a FIFO capacity limiter; work runs on the shared executor."""
 
     __slots__ = (
-        "name", "concurrency", "timeout", "description",
-        "_semaphore", "_executor",
-        "_running", "_queued", "_total", "_errors", "_lock",
+        "name", "concurrency", "timeout", "description", "queue_limit",
+        "_limiter", "_distributed", "_total", "_errors", "_waits",
+        "_run_in_executor",
     )
 
     def __init__(self, name: str, concurrency: int, timeout: float, description: str):
@@ -74,70 +131,124 @@ class _Pool:
         self.concurrency = concurrency
         self.timeout = timeout
         self.description = description
-        self._semaphore = asyncio.Semaphore(concurrency)
-        self._executor = ThreadPoolExecutor(
-            max_workers=max(concurrency, 1),
-            thread_name_prefix=f"pool-{name}",
-        )
-        self._running = 0
-        self._queued = 0
+        self.queue_limit = concurrency * _QUEUE_FACTOR
+        # Cancellation-safe and first-come first-served, unlike
+        # asyncio.Semaphore + wait_for; it also tracks running/waiting for us.
+        self._limiter = CapacityLimiter(concurrency)
+        # Cluster-wide bound across processes when REDIS_URL is set, else None
+        self._distributed = semaphore_from_env(f"pool:{name}", concurrency)
+        # Only ever touched from the event loop thread (run() is a coroutine),
+        # so plain ints need no lock.
         self._total = 0
         self._errors = 0
-        self._lock = Lock()
+        # Seconds each recent caller spent waiting for a slot (timeouts included)
+        self._waits: deque[float] = deque(maxlen=_WAIT_SAMPLES)
+        # loop.run_in_executor bound once by WorkerPool.install(); None until then
+        self._run_in_executor: Callable[..., Any] | None = None
 
     async def run(self, fn: Callable[..., Any], *args: Any, timeout: float | None = None) -> Any:
         """
-        Submit *fn(*args)* to this pool's thread executor, respecting concurrency.
+        Submit *fn(*args)* to the loop's default executor, respecting concurrency.
 
         Raises TimeoutError if the pool is full and the caller waits too long.
         """
         effective_timeout = timeout if timeout is not None else self.timeout
 
-        with self._lock:
-            self._queued += 1
-
+        t0 = time.perf_counter()
+        token = None
         try:
-            # Wait for a slot
-            await asyncio.wait_for(self._semaphore.acquire(), timeout=effective_timeout)
-        except asyncio.TimeoutError:
-            with self._lock:
-                self._queued -= 1
+            # Wait for a slot (local first, then cluster-wide if configured).
+            # A free slot with nobody queued is taken without arming a timeout.
+            try:
+                self._limiter.acquire_nowait()
+            except WouldBlock:
+                if self.queue_limit and self._limiter.statistics().tasks_waiting >= self.queue_limit:
+                    raise AppError(
+                        INFERENCE_BUSY,
+                        detail=f"Worker pool '{self.name}' queue is full ({self.queue_limit} waiting)",
+                    ) from None
+                with fail_after(effective_timeout):
+                    await self._limiter.acquire()
+            if self._distributed is not None:
+                try:
+                    with fail_after(effective_timeout - (time.perf_counter() - t0)):
+                        token = await self._distributed.acquire()
+                except BaseException:
+                    self._limiter.release()
+                    raise
+        except TimeoutError:
+            self._waits.append(time.perf_counter() - t0)
             raise TimeoutError(
                 f"Worker pool '{self.name}' is busy — all {self.concurrency} slot(s) "
                 f"occupied for >{effective_timeout}s"
-            )
+            ) from None
 
-        with self._lock:
-            self._queued -= 1
-            self._running += 1
-            self._total += 1
+        self._waits.append(time.perf_counter() - t0)
+        self._total += 1
 
         try:
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(self._executor, fn, *args)
+            run_in_executor = self._run_in_executor or asyncio.get_running_loop().run_in_executor
+            target = celery_target(self.name, fn)
+            if target is not None:
+                return await run_in_executor(
+                    None, run_remote, target, args, self.name, effective_timeout,
+                )
+            # run_in_executor doesn't carry contextvars over (unlike
+            # asyncio.to_thread), so run fn inside a copy of the caller's
+            # context: the request ID stays visible in the worker thread.
+            return await run_in_executor(None, contextvars.copy_context().run, fn, *args)
         except Exception:
-            with self._lock:
-                self._errors += 1
+            self._errors += 1
             raise
         finally:
-            self._semaphore.release()
-            with self._lock:
-                self._running -= 1
+            if token is not None:
+                await self._distributed.release(token)
+            self._limiter.release()
 
     def status(self) -> dict[str, Any]:
-        with self._lock:
-            return {
-                "description": self.description,
-                "concurrency": self.concurrency,
-                "running": self._running,
-                "queued": self._queued,
-                "total_processed": self._total,
-                "total_errors": self._errors,
-                "is_busy": self._running >= self.concurrency,
-            }
+        stats = self._limiter.statistics()
+        return {
+            "description": self.description,
+            "concurrency": self.concurrency,
+            "running": stats.borrowed_tokens,
+            "queued": stats.tasks_waiting,
+            "queue_limit": self.queue_limit,
+            "total_processed": self._total,
+            "total_errors": self._errors,
+            "is_busy": stats.borrowed_tokens >= self.concurrency,
+            **self._wait_percentiles(),
+        }
+
+    def _wait_percentiles(self) -> dict[str, float]:
+        waits = sorted(self._waits)
+        n = len(waits)
+        if n == 0:
+            return {"queue_wait_p50_ms": 0, "queue_wait_p90_ms": 0, "queue_wait_p99_ms": 0}
+        return {
+            "queue_wait_p50_ms": round(waits[n * 50 // 100] * 1000, 1),
+            "queue_wait_p90_ms": round(waits[min(n * 90 // 100, n - 1)] * 1000, 1),
+            "queue_wait_p99_ms": round(waits[min(n * 99 // 100, n - 1)] * 1000, 1),
+        }
 
-    def shutdown(self) -> None:
-        self._executor.shutdown(wait=False)
+
+# ---------------------------------------------------------------------------
+# LLM gate lookup (for the combined status)
+# ---------------------------------------------------------------------------
+
+_IMPORT_FAILED = object()
+_llm_cls: Any = None
+
+
+def _get_llm_cls() -> Any:
+    """Return the LocalLLM class, importing it on first use; None if unavailable."""
+    global _llm_cls
+    if _llm_cls is None:
+        try:
+            from app.llm.local_llm import LocalLLM
+            _llm_cls = LocalLLM
+        except ImportError:
+            _llm_cls = _IMPORT_FAILED
+    return None if _llm_cls is _IMPORT_FAILED else _llm_cls
 
 
 # ---------------------------------------------------------------------------
@@ -162,6 +273,10 @@ class WorkerPool:
             with cls._init_lock:
                 if cls._instance is None:
                     inst = super().__new__(cls)
+                    inst._executor = ThreadPoolExecutor(
+                        max_workers=max(_THREAD_POOL_SIZE, 1),
+                        thread_name_prefix="pool",
+                    )
                     inst._pools: dict[str, _Pool] = {}
                     for name, cfg in _POOL_CONFIGS.items():
                         inst._pools[name] = _Pool(
@@ -171,15 +286,22 @@ class WorkerPool:
                             description=cfg["description"],
                         )
                     logger.info(
-                        "WorkerPool ready: %s",
+                        "WorkerPool ready: %s, threads=%d",
                         ", ".join(
                             f"{n}(concurrency={p.concurrency})"
                             for n, p in inst._pools.items()
                         ),
+                        _THREAD_POOL_SIZE,
                     )
                     cls._instance = inst
         return cls._instance
 
+    def install(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Make the shared executor the loop's default (call from lifespan startup)."""
+        loop.set_default_executor(self._executor)
+        for pool in self._pools.values():
+            pool._run_in_executor = loop.run_in_executor
+
     async def run(
         self,
         pool_name: str,
@@ -187,7 +309,7 @@ class WorkerPool:
         *args: Any,
         timeout: float | None = None,
     ) -> Any:
-        """Run *fn* in the named pool's thread executor."""
+        """Run *fn* on the shared executor, bounded by the named pool's limiter."""
         pool = self._pools.get(pool_name)
         if pool is None:
             raise ValueError(f"Unknown worker pool: '{pool_name}'")
@@ -195,25 +317,41 @@ class WorkerPool:
 
     def status(self) -> dict[str, dict[str, Any]]:
         """Combined status of every pool (for the /workers/status endpoint)."""
-        result: dict[str, Any] = {}
-        for name, pool in self._pools.items():
-            result[name] = pool.status()
+        result: dict[str, Any] = {name: pool.status() for name, pool in self._pools.items()}
+        result["executor"] = self._executor_status()
 
         # Include LLM gate status from its own singleton
-        try:
-            from app.llm.local_llm import LocalLLM
-            llm_status = LocalLLM().get_queue_status()
+        llm_cls = _get_llm_cls()
+        if llm_cls is not None:
             result["llm"] = {
                 "description": "LLM inference (priority queue)",
-                **llm_status,
+                **llm_cls().get_queue_status(),
             }
-        except Exception:
+        else:
             result["llm"] = {"description": "LLM inference (not loaded)"}
 
         return result
 
+    def _executor_status(self) -> dict[str, Any]:
+        """
+        Staffing of the shared thread executor.
+
+        Reads ThreadPoolExecutor internals (getattr-guarded): threads are
+        started lazily, so threads_alive < max_workers is normal when idle,
+        but a non-zero work_queue_depth with threads_alive < max_workers
+        means threads could not be started.
+        """
+        exe = self._executor
+        threads = getattr(exe, "_threads", ())
+        work_queue = getattr(exe, "_work_queue", None)
+        return {
+            "description": "Shared thread executor",
+            "max_workers": getattr(exe, "_max_workers", None),
+            "threads_alive": sum(1 for t in threads if t.is_alive()),
+            "work_queue_depth": work_queue.qsize() if work_queue is not None else None,
+        }
+
     def shutdown(self) -> None:
-        """Shut down all thread executors (call from lifespan teardown)."""
-        for pool in self._pools.values():
-            pool.shutdown()
+        """Shut down the shared thread executor (call from lifespan teardown)."""
+        self._executor.shutdown(wait=False)
         logger.info("WorkerPool shut down")
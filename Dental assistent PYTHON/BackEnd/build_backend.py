@@ -74,6 +74,18 @@ def build_backend():
     print(f"Building dental-backend for {target}...")
     print(f"Output: {output_path}")
 
+    # Precompile the seed knowledge base (optional: the app falls back to JSONL)
+    try:
+        from build_knowledge import build_knowledge
+        build_knowledge()
+    except ImportError:
+        print("zstandard not installed - shipping the JSONL knowledge base only")
+    try:
+        from build_knowledge import build_seed_embeddings
+        build_seed_embeddings()
+    except ImportError:
+        print("sentence-transformers not installed - seed knowledge will be embedded on first boot")
+
     # PyInstaller command
     pyinstaller_args = [
         sys.executable, "-m", "PyInstaller",
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Compile the seed dental knowledge base for release builds.
+
+Reads app/rag/dental_knowledge.jsonl and writes
+app/rag/dental_knowledge.pkl.zst: a zstd-compressed pickle of
+(content, meta) tuples that the frozen backend loads in one shot instead
+of parsing JSON line by line.  Plain tuples (not Document objects) keep
+the artifact small and independent of the installed Haystack version.
+
+It also writes app/rag/seed_embeddings.npz: the corpus embedded once with
+the RAG embedding model, keyed by content hash, so first-boot indexing
+writes the vectors straight to Chroma instead of running the embedder.
+Vectors are stored as int8 with a float32 scale per vector (4x smaller).
+
+Usage:
+    python build_knowledge.py
+
+Requires the ``zstandard`` package (and ``sentence-transformers`` for the
+embeddings).  build_backend.py runs this automatically before PyInstaller
+when they are installed.
+"""
+
+import hashlib
+import pickle
+import sys
+from pathlib import Path
+
+import orjson
+
+KNOWLEDGE_DIR = Path(__file__).parent.resolve() / "app" / "rag"
+SOURCE = KNOWLEDGE_DIR / "dental_knowledge.jsonl"
+TARGET = KNOWLEDGE_DIR / "dental_knowledge.pkl.zst"
+EMBEDDINGS_TARGET = KNOWLEDGE_DIR / "seed_embeddings.npz"
+
+
+def _read_contents() -> list[str]:
+    with open(SOURCE, "rb") as f:
+        return [orjson.loads(line)["content"] for line in f if line.strip()]
+
+
+def build_knowledge() -> Path:
+    """Compile the JSONL corpus into the zstd pickle and return its path."""
+    import zstandard
+
+    records = []
+    with open(SOURCE, "rb") as f:
+        for line in f:
+            if line.strip():
+                doc = orjson.loads(line)
+                records.append((doc["content"], doc.get("meta", {})))
+
+    payload = pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL)
+    compressed = zstandard.ZstdCompressor(level=19).compress(payload)
+
+    tmp = TARGET.with_suffix(TARGET.suffix + ".tmp")
+    tmp.write_bytes(compressed)
+    tmp.replace(TARGET)
+
+    print(f"Compiled {len(records)} documents: {SOURCE.name} -> {TARGET.name} "
+          f"({len(compressed) / 1024:.1f} KB, was {SOURCE.stat().st_size / 1024:.1f} KB)")
+    return TARGET
+
+
+def build_seed_embeddings() -> Path:
+    """Embed the corpus with the RAG embedding model and return the .npz path."""
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+
+    from app.rag.store import EMBEDDING_MODEL
+
+    contents = _read_contents()
+    # Same call SentenceTransformersDocumentEmbedder makes with its defaults
+    # (no prefix, no meta fields, no normalization)
+    model = SentenceTransformer(EMBEDDING_MODEL)
+    embeddings = model.encode(contents, batch_size=32, convert_to_numpy=True).astype(np.float32)
+    hashes = np.array([hashlib.sha256(c.encode("utf-8")).hexdigest() for c in contents])
+
+    # Symmetric per-vector int8 quantization: v ~= q * scale, scale = max|v| / 127
+    scales = np.abs(embeddings).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(embeddings / scales[:, None]).astype(np.int8)
+
+    tmp = EMBEDDINGS_TARGET.with_name(EMBEDDINGS_TARGET.stem + ".tmp.npz")
+    np.savez(
+        tmp,
+        embeddings_int8=quantized,
+        scales=scales.astype(np.float32),
+        content_sha256=hashes,
+        model=np.array(EMBEDDING_MODEL),
+    )
+    tmp.replace(EMBEDDINGS_TARGET)
+
+    print(f"Embedded {len(contents)} documents with {EMBEDDING_MODEL} -> {EMBEDDINGS_TARGET.name} "
+          f"({EMBEDDINGS_TARGET.stat().st_size / 1024:.1f} KB)")
+    return EMBEDDINGS_TARGET
+
+
+if __name__ == "__main__":
+    try:
+        build_knowledge()
+    except ImportError:
+        print("zstandard is not installed: pip install zstandard")
+        sys.exit(1)
+    try:
+        build_seed_embeddings()
+    except ImportError:
+        print("sentence-transformers is not installed: seed embeddings not built")
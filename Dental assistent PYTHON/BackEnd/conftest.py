@@ -72,6 +72,12 @@ class FakeLLM:
         for token in SAMPLE_SMARTNOTE.split():
             yield token + " "
 
+    def preload(self) -> bool:
+        return True
+
+    async def reload(self, timeout=None) -> None:
+        return None
+
     def get_queue_status(self) -> dict:
         return {
             "max_concurrency": 1,
@@ -116,8 +122,12 @@ def client(tmp_path: Path):
     - HardwareDetector → cpu_only
     - health checks → always True
     """
+    from app.api.health import _health_cache
+    from app.config import _model_ready_cache
     from app.worker import WorkerPool
     WorkerPool._instance = None
+    _health_cache["result"] = None
+    _model_ready_cache["ts"] = 0.0
 
     model_file = tmp_path / "fake-model.gguf"
     model_file.write_bytes(b"\x00" * 1024)
@@ -142,8 +152,6 @@ def client(tmp_path: Path):
 
     with (
         patch("app.config.get_llm_model_path", return_value=model_file),
-        patch("app.api.rag.get_llm_model_path", return_value=model_file),
-        patch("app.api.summarize.get_llm_model_path", return_value=model_file),
         patch("app.api.rag.initialize_rag"),
         patch("app.config.HardwareDetector.detect", return_value=hw_info),
         patch("app.config.analyze_hardware", return_value="cpu_only"),
@@ -8,7 +8,9 @@ Responsibilities (and nothing else):
 4. Mount routers
 """
 
+import asyncio
 import logging
+import os
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
@@ -21,6 +23,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_hardware_info
 from app.middleware import MaxRequestSizeMiddleware, RateLimitMiddleware
 from app.observability import RequestTracingMiddleware
+from app.responses import FastJSONResponse
 from app.security import check_api_key_configured, validate_security_config
 
 logging.basicConfig(level=logging.INFO)
@@ -39,8 +42,23 @@ async def lifespan(app: FastAPI):
     if check_api_key_configured():
         logger.info("API key configured from environment")
 
-    # Hardware
-    hw_info = get_hardware_info()
+    # Create the WorkerPool first so its shared executor backs every
+    # asyncio.to_thread() call below as well as the named pools.
+    from app.worker import WorkerPool
+
+    worker_pool = WorkerPool()
+    worker_pool.install(asyncio.get_running_loop())
+
+    # Hardware detection (GPU CLI probes, CUDA/Metal library loads) and RAG
+    # init (Chroma open, seeding) are independent and mostly blocking I/O, so
+    # they run side by side in worker threads instead of back to back.
+    # RAG is non-blocking — it degrades gracefully if deps are missing.
+    from app.api.rag import initialize_rag, shutdown_rag
+
+    hw_info, _ = await asyncio.gather(
+        asyncio.to_thread(get_hardware_info),
+        asyncio.to_thread(initialize_rag),
+    )
     logger.info(
         "Hardware detected: %s (GPU: %s, VRAM: %s GB, Backend: %s)",
         hw_info["profile"],
@@ -49,20 +67,28 @@ async def lifespan(app: FastAPI):
         "supported" if hw_info.get("backend_gpu_support") else "not supported",
     )
 
-    # RAG (non-blocking — degrades gracefully if deps are missing)
-    from app.api.rag import initialize_rag
+    # The hardware profile can't change while we run, so /health reads the
+    # model path and expected size from app.state instead of re-deriving them.
+    from app.config import MODEL_CONFIGS, get_llm_model_path
 
-    initialize_rag()
+    app.state.llm_model_path = get_llm_model_path(hw_info["profile"])
+    app.state.llm_expected_size_gb = MODEL_CONFIGS[hw_info["profile"]].get("size_gb", 0)
 
-    # Eagerly create the WorkerPool so it's ready before the first request
-    from app.worker import WorkerPool
+    # Load the LLM in the background so the first SmartNote doesn't pay the
+    # multi-second model load; requests arriving earlier simply wait for it.
+    llm_preload = None
+    if os.getenv("LLM_PRELOAD", "1") == "1" and app.state.llm_model_path.exists():
+        from app.llm.local_llm import LocalLLM
 
-    worker_pool = WorkerPool()
+        llm_preload = asyncio.create_task(asyncio.to_thread(LocalLLM().preload))
 
     yield
 
-    # Teardown: drain worker threads
+    if llm_preload is not None and not llm_preload.done():
+        llm_preload.cancel()
+    # Teardown: drain worker threads, then let queued RAG writes land
     worker_pool.shutdown()
+    shutdown_rag()
     logger.info("Dental Assistant Backend shutting down")
 
 
@@ -70,7 +96,12 @@ async def lifespan(app: FastAPI):
 # App creation
 # ---------------------------------------------------------------------------
 
-app = FastAPI(title="Dental Assistant Backend", lifespan=lifespan)
+# orjson for every JSON response body (routes and error handlers)
+app = FastAPI(
+    title="Dental Assistant Backend",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 # ---------------------------------------------------------------------------
 # Middleware (evaluated bottom → top; order matters for CORS)
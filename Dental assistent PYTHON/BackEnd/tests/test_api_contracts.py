@@ -14,7 +14,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from conftest import API_KEY, AUTH_HEADERS, SAMPLE_TRANSCRIPTION
+from conftest import API_KEY, AUTH_HEADERS, SAMPLE_SMARTNOTE, SAMPLE_TRANSCRIPTION
 
 
 # ======================================================================
@@ -36,6 +36,14 @@ class TestHealthEndpoint:
         assert isinstance(data["models_ready"], bool)
         assert isinstance(data["whisper_ready"], bool)
 
+    def test_health_reuses_model_checks(self, client):
+        with patch("app.api.health._is_whisper_valid", return_value=True) as whisper_check:
+            client.get("/health")
+            client.get("/health")
+            assert whisper_check.call_count == 1
+            client.get("/health", params={"deep": 1})
+            assert whisper_check.call_count == 2
+
 
 class TestLLMStatusEndpoint:
     def test_llm_status(self, client):
@@ -53,11 +61,25 @@ class TestLLMStatusEndpoint:
         assert isinstance(data["is_busy"], bool)
 
 
+class TestReloadModelEndpoint:
+    def test_reload_model(self, client):
+        resp = client.post("/setup/reload-model", headers=AUTH_HEADERS)
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "reloaded"
+
+
 class TestMetricsEndpoint:
     def test_metrics_returns_200(self, client):
         resp = client.get("/metrics")
         assert resp.status_code == 200
 
+    def test_metrics_keyed_by_route_template(self, client):
+        client.post("/errors/aaa111/dismiss", headers=AUTH_HEADERS)
+        client.post("/errors/bbb222/dismiss", headers=AUTH_HEADERS)
+        endpoints = client.get("/metrics").json()["endpoints"]
+        assert "POST /errors/{error_id}/dismiss" in endpoints
+        assert not any("aaa111" in key for key in endpoints)
+
 
 class TestWorkersStatusEndpoint:
     def test_workers_status_has_pools(self, client):
@@ -67,6 +89,17 @@ class TestWorkersStatusEndpoint:
         assert "rag" in data
         assert "whisper" in data
 
+    def test_workers_status_reports_queue_wait(self, client):
+        rag = client.get("/workers/status").json()["rag"]
+        for key in ("queue_wait_p50_ms", "queue_wait_p90_ms", "queue_wait_p99_ms"):
+            assert key in rag
+
+    def test_workers_status_reports_executor(self, client):
+        executor = client.get("/workers/status").json()["executor"]
+        assert executor["max_workers"] >= 1
+        assert executor["threads_alive"] <= executor["max_workers"]
+        assert executor["work_queue_depth"] >= 0
+
 
 # ======================================================================
 # Auth enforcement
@@ -83,6 +116,7 @@ class TestAuthEnforcement:
         ("POST", "/consultations/save", {"smartnote": "test"}),
         ("POST", "/consultations/search", {"query": "test"}),
         ("GET", "/consultations/export", None),
+        ("POST", "/setup/reload-model", None),
     ]
 
     @pytest.mark.parametrize(
@@ -111,6 +145,21 @@ class TestAuthEnforcement:
             resp = client.get(path, headers=bad_headers)
         assert resp.status_code == 403
 
+    def test_rotated_key_applies_after_reload(self, client, monkeypatch):
+        from app.security import reload_api_key
+
+        monkeypatch.setenv("APP_API_KEY", "rotated-key-67890")
+        try:
+            reload_api_key()
+            body = {"query": "test"}
+            resp = client.post("/consultations/search", json=body, headers=AUTH_HEADERS)
+            assert resp.status_code == 403
+            resp = client.post("/consultations/search", json=body, headers={"X-API-Key": "rotated-key-67890"})
+            assert resp.status_code == 200
+        finally:
+            monkeypatch.setenv("APP_API_KEY", API_KEY)
+            reload_api_key()
+
 
 # ======================================================================
 # Summarize endpoints
@@ -129,6 +178,15 @@ class TestSummarizeEndpoint:
         assert isinstance(data["summary"], str)
         assert len(data["summary"]) > 0
 
+    def test_summarize_without_model_returns_503(self, client, tmp_path):
+        with patch("app.config.get_llm_model_path", return_value=tmp_path / "missing.gguf"):
+            resp = client.post(
+                "/summarize",
+                json={"text": SAMPLE_TRANSCRIPTION},
+                headers=AUTH_HEADERS,
+            )
+        assert resp.status_code == 503
+
     def test_summarize_empty_text(self, client):
         resp = client.post(
             "/summarize",
@@ -190,6 +248,22 @@ class TestSummarizeStreamEndpoint:
             parsed = json.loads(payload)
             assert "chunk" in parsed
 
+    def test_stream_chunks_reassemble_full_text(self, client):
+        resp = client.post(
+            "/summarize-stream",
+            json={"text": SAMPLE_TRANSCRIPTION},
+            headers=AUTH_HEADERS,
+        )
+        chunks = [
+            json.loads(line[len("data:"):])["chunk"]
+            for line in resp.text.split("\n")
+            if line.startswith("data:") and "[DONE]" not in line
+        ]
+        tokens = SAMPLE_SMARTNOTE.split()
+        # Tokens are batched into fewer frames without losing any text
+        assert len(chunks) < len(tokens)
+        assert "".join(chunks) == "".join(t + " " for t in tokens)
+
     def test_stream_empty_text(self, client):
         resp = client.post(
             "/summarize-stream",
@@ -198,6 +272,14 @@ class TestSummarizeStreamEndpoint:
         )
         assert resp.status_code == 400
 
+    def test_stream_oversize_text_rejected(self, client):
+        resp = client.post(
+            "/summarize-stream",
+            json={"text": "a" * 200_001},
+            headers=AUTH_HEADERS,
+        )
+        assert resp.status_code == 422
+
 
 # ======================================================================
 # RAG status endpoint (no auth)